@@ -5,7 +5,8 @@ Abstract interface for all Reflect analyzers.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from sparkey_reflect.core.models import AnalysisResult, RuleFileInfo, Session
 
@@ -37,3 +38,17 @@ class BaseReflectAnalyzer(ABC):
         Returns:
             AnalysisResult with score (0-100), metrics, and insights.
         """
+
+    @staticmethod
+    def _period_bounds(
+        sessions: List[Session],
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Earliest start and latest end time across sessions, in one pass."""
+        period_start: Optional[datetime] = None
+        period_end: Optional[datetime] = None
+        for s in sessions:
+            if s.start_time and (period_start is None or s.start_time < period_start):
+                period_start = s.start_time
+            if s.end_time and (period_end is None or s.end_time > period_end):
+                period_end = s.end_time
+        return period_start, period_end
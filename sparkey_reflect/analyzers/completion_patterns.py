@@ -70,8 +70,7 @@ class CompletionPatternsAnalyzer(BaseReflectAnalyzer):
             if e.get("language") and e.get("language") != "unknown"
         ))
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
@@ -72,7 +72,7 @@ class ContextManagementAnalyzer(BaseReflectAnalyzer):
         all_ctx_efficiency = []
 
         for session in sessions:
-            user_turns = [t for t in session.turns if t.role == "user" and t.content]
+            user_turns = session.user_turns
             if not user_turns:
                 continue
 
@@ -120,8 +120,7 @@ class ContextManagementAnalyzer(BaseReflectAnalyzer):
             (ctx_eff_dim, 0.20),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
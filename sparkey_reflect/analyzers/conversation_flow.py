@@ -81,7 +81,7 @@ class ConversationFlowAnalyzer(BaseReflectAnalyzer):
         all_iteration_velocity = []
 
         for session in sessions:
-            user_turns = [t for t in session.turns if t.role == "user" and t.content]
+            user_turns = session.user_turns
             if not user_turns:
                 continue
 
@@ -127,8 +127,11 @@ class ConversationFlowAnalyzer(BaseReflectAnalyzer):
                 all_first_acceptance.append(1.0)
 
             # Iteration Velocity: ratio of assistant tokens to user tokens
-            user_tokens = sum(len(t.content.split()) for t in session.turns if t.role == "user" and t.content)
-            assistant_tokens = sum(len(t.content.split()) for t in session.turns if t.role == "assistant" and t.content)
+            user_tokens = sum(len(t.content.split()) for t in user_turns)
+            assistant_tokens = sum(
+                len(t.content.split()) for t in session.turns
+                if t.role == "assistant" and t.content
+            )
             if user_tokens > 0:
                 velocity_ratio = assistant_tokens / user_tokens
             else:
@@ -158,8 +161,7 @@ class ConversationFlowAnalyzer(BaseReflectAnalyzer):
             (velocity_dim, 0.20),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
@@ -73,14 +73,13 @@ class OutcomeTrackerAnalyzer(BaseReflectAnalyzer):
             if s.workspace_path:
                 workspaces.add(s.workspace_path)
 
+        period_start, period_end = self._period_bounds(sessions)
+
         # Get git commits for each workspace
+        since = period_start or datetime.now(timezone.utc) - timedelta(days=30)
         all_commits: List[Dict] = []
         for ws in workspaces:
-            period_start = min(
-                (s.start_time for s in sessions if s.start_time),
-                default=datetime.now(timezone.utc) - timedelta(days=30),
-            )
-            commits = self._get_git_commits(ws, since=period_start)
+            commits = self._get_git_commits(ws, since=since)
             all_commits.extend(commits)
 
         if not all_commits:
@@ -138,9 +137,6 @@ class OutcomeTrackerAnalyzer(BaseReflectAnalyzer):
             (trend_dim, 0.20),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
-
         return AnalysisResult(
             analyzer_key=self.get_key(),
             analyzer_name=self.get_name(),
@@ -55,8 +55,7 @@ class PromptQualityAnalyzer(BaseReflectAnalyzer):
         all_cot = []
 
         for session in sessions:
-            user_turns = [t for t in session.turns if t.role == "user" and t.content]
-            for turn in user_turns:
+            for turn in session.user_turns:
                 all_specificity.append(self._score_specificity(turn))
                 all_context.append(self._score_context_richness(turn))
                 all_clarity.append(self._score_clarity(turn))
@@ -86,8 +85,7 @@ class PromptQualityAnalyzer(BaseReflectAnalyzer):
             (chain_of_thought, 0.15),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
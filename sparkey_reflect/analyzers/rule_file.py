@@ -69,6 +69,9 @@ ECOSYSTEM_FILE_TYPES = {
     "claude_settings", "memory",
 }
 
+# (distinct rule file types, score) for ecosystem coverage
+ECOSYSTEM_COUNT_SCORES = ((1, 0.3), (2, 0.5), (3, 0.7), (4, 0.85), (5, 1.0))
+
 
 class RuleFileAnalyzer(BaseReflectAnalyzer):
     """Analyzes quality of AI instruction and rule files."""
@@ -156,9 +159,7 @@ class RuleFileAnalyzer(BaseReflectAnalyzer):
         else:
             currency_dim = 1 - sigmoid(days_since_update, 45, 0.05)
 
-        ecosystem_dim = count_score(ecosystem_count, [
-            (1, 0.3), (2, 0.5), (3, 0.7), (4, 0.85), (5, 1.0),
-        ])
+        ecosystem_dim = count_score(ecosystem_count, ECOSYSTEM_COUNT_SCORES)
 
         overall = weighted_sum([
             (completeness_dim, 0.25),
@@ -168,8 +169,7 @@ class RuleFileAnalyzer(BaseReflectAnalyzer):
             (ecosystem_dim, 0.15),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None) if sessions else None
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None) if sessions else None
+        period_start, period_end = self._period_bounds(sessions or [])
 
         total_words = sum(rf.word_count for rf in existing_files)
         total_sections = sum(rf.section_count for rf in existing_files)
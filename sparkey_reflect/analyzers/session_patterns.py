@@ -55,7 +55,16 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
                 session_count=0,
             )
 
-        durations = [s.duration_minutes for s in sessions if s.duration_minutes > 0]
+        # Pull the per-session columns in one pass
+        durations = []
+        total_tokens = 0
+        type_counts = Counter()
+        for s in sessions:
+            if s.duration_minutes > 0:
+                durations.append(s.duration_minutes)
+            total_tokens += s.total_input_tokens + s.total_output_tokens
+            type_counts[s.session_type.value] += 1
+
         avg_duration = sum(durations) / len(durations) if durations else 0
 
         # Sessions per day
@@ -66,15 +75,13 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
         peak_hours = self._compute_peak_hours(sessions)
 
         # Task type distribution
-        type_counts = Counter(s.session_type.value for s in sessions)
-        type_dist = {k: v / len(sessions) for k, v in type_counts.items()}
-        active_types = sum(1 for v in type_dist.values() if v > 0.05)
+        active_threshold = 0.05 * len(sessions)
+        active_types = sum(1 for v in type_counts.values() if v > active_threshold)
 
         # Fatigue detection
         fatigue_rate = self._detect_fatigue(sessions)
 
         # Token efficiency
-        total_tokens = sum(s.total_tokens for s in sessions)
         total_minutes = sum(durations)
         tokens_per_minute = total_tokens / total_minutes if total_minutes > 0 else 0
 
@@ -96,8 +103,7 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
             (deep_work_dim, 0.25),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
@@ -112,7 +118,9 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
                 "fatigue_rate": round(fatigue_rate, 3),
                 "tokens_per_minute": round(tokens_per_minute, 1),
                 "deep_work_ratio": round(deep_work_ratio, 3),
-                "task_type_distribution": {k: round(v, 3) for k, v in type_dist.items()},
+                "task_type_distribution": {
+                    k: round(v / len(sessions), 3) for k, v in type_counts.items()
+                },
             },
             insights=[],
             session_count=len(sessions),
@@ -126,11 +134,8 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
 
     def _get_active_days(self, sessions: List[Session]) -> List[str]:
         """Get unique days with sessions."""
-        days = set()
-        for s in sessions:
-            if s.start_time:
-                days.add(s.start_time.strftime("%Y-%m-%d"))
-        return sorted(days)
+        days = {s.start_time.date() for s in sessions if s.start_time}
+        return [d.isoformat() for d in sorted(days)]
 
     def _compute_peak_hours(self, sessions: List[Session]) -> List[int]:
         """Return top 3 most active hours."""
@@ -156,7 +161,7 @@ class SessionPatternsAnalyzer(BaseReflectAnalyzer):
                 continue
             analyzable += 1
 
-            user_turns = [t for t in session.turns if t.role == "user" and t.content]
+            user_turns = session.user_turns
             if len(user_turns) < 4:
                 continue
 
@@ -14,9 +14,14 @@ specialized tools (Edit vs Bash sed) indicates mastery.
 """
 
 import re
-from collections import Counter
+from collections import Counter, defaultdict
 from typing import Dict, List, Optional, Set
 
+try:
+    import re2  # optional: pip install sparkey-reflect[re2]
+except ImportError:
+    re2 = None
+
 from sparkey_reflect.analyzers.base_analyzer import BaseReflectAnalyzer
 from sparkey_reflect.core.models import (
     AnalysisResult,
@@ -27,20 +32,26 @@ from sparkey_reflect.core.scoring import count_score, diminishing, sigmoid, weig
 
 # Known built-in tools for each AI coding tool
 BUILTIN_TOOLS = {
-    "claude_code": {
+    "claude_code": frozenset({
         "Read", "Write", "Edit", "Bash", "Glob", "Grep",
         "Task", "WebFetch", "WebSearch", "NotebookEdit",
         "AskUserQuestion", "EnterPlanMode", "ExitPlanMode",
         "TodoWrite", "TodoRead",
-    },
-    "cursor": {
+    }),
+    "cursor": frozenset({
         "codebase_search", "read_file", "edit_file", "run_terminal_command",
         "file_search", "grep_search", "list_dir", "delete_file",
-    },
+    }),
 }
 
 # Tools that indicate MCP usage (non-builtin, typically from .mcp.json)
-MCP_TOOL_PREFIXES = ["mcp__", "mcp_"]
+MCP_TOOL_PREFIXES = ("mcp__", "mcp_")
+
+# (distinct MCP tools used, score) once MCP servers are configured
+MCP_TOOL_COUNT_SCORES = ((0, 0.3), (1, 0.7), (2, 0.85), (3, 1.0))
+
+# Rule-file types that mean MCP servers are configured
+MCP_CONFIG_FILE_TYPES = frozenset({"mcp_config", "claude_user_mcp"})
 
 # Patterns in user messages that suggest slash command usage
 SLASH_COMMAND_PATTERNS = [
@@ -62,10 +73,42 @@ INAPPROPRIATE_FILE_BASH_PATTERNS = [
     r"\bsed\b", r"\bawk\b", r"\becho\s+.*>", r"\bcat\s+<<",
 ]
 APPROPRIATE_READ_TOOLS = {"Read", "read_file"}
+SHELL_TOOLS = {"Bash", "run_terminal_command"}
 INAPPROPRIATE_READ_BASH_PATTERNS = [
     r"\bcat\b", r"\bhead\b", r"\btail\b",
 ]
 
+# Compiled once at import; the raw pattern lists above stay for reference.
+# User-content patterns are all lowercase and run against lowercased text,
+# so they need no IGNORECASE.
+
+# The leading-command pattern is only tried via .match() once the message
+# starts with "/"; the free-text pattern is searched as usual
+LEADING_SLASH_COMMAND_RE = re.compile(r"/\w")
+INLINE_SLASH_COMMAND_RE = re.compile(SLASH_COMMAND_PATTERNS[1])
+AUTOMATION_OPPORTUNITY_RES = [
+    (re.compile(p), category) for p, category in AUTOMATION_OPPORTUNITY_PATTERNS
+]
+# Every user-content pattern fused into one alternation: a turn that misses it
+# cannot match any individual pattern, so most turns need a single scan
+USER_CONTENT_PATTERN = "|".join(
+    f"(?:{p})"
+    for p in SLASH_COMMAND_PATTERNS + [p for p, _ in AUTOMATION_OPPORTUNITY_PATTERNS]
+)
+USER_CONTENT_RE = re.compile(USER_CONTENT_PATTERN)
+# RE2 scans in linear time but its \b and \w are ASCII-only, so it is used
+# for ASCII messages only, where both engines agree
+USER_CONTENT_RE2 = re2.compile(USER_CONTENT_PATTERN) if re2 is not None else None
+INAPPROPRIATE_FILE_BASH_RES = [re.compile(p) for p in INAPPROPRIATE_FILE_BASH_PATTERNS]
+INAPPROPRIATE_READ_BASH_RES = [re.compile(p) for p in INAPPROPRIATE_READ_BASH_PATTERNS]
+
+# Appropriateness role of each relevant tool, resolved with one lookup per call
+TOOL_ROLES: Dict[str, str] = {
+    **{t: "file_mod" for t in APPROPRIATE_FILE_TOOLS},
+    **{t: "file_read" for t in APPROPRIATE_READ_TOOLS},
+    **{t: "shell" for t in SHELL_TOOLS},
+}
+
 
 class ToolUsageAnalyzer(BaseReflectAnalyzer):
     """Analyzes effectiveness of tool and command usage."""
@@ -89,14 +132,19 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
                 session_count=0,
             )
 
+        # Resolve the tool-specific built-in set once, up front
+        tool_type = sessions[0].tool.value
+        builtin_set = BUILTIN_TOOLS.get(tool_type, BUILTIN_TOOLS["claude_code"])
+
         # Collect tool usage across all sessions
-        all_tool_names: List[str] = []
-        all_mcp_tools: List[str] = []
+        tool_counter: Counter = Counter()
+        mcp_counter: Counter = Counter()
+        total_tool_calls = 0
+        mcp_tool_calls = 0
         total_user_turns = 0
         slash_command_count = 0
-        automation_misses: Dict[str, int] = Counter()
-        tools_per_session: List[int] = []
-        unique_tools_per_session: List[int] = []
+        automation_misses: Dict[str, int] = defaultdict(int)
+        unique_tools_sum = 0
 
         # Tool appropriateness tracking
         file_mod_appropriate = 0
@@ -105,63 +153,81 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
         file_read_inappropriate = 0
 
         for session in sessions:
-            session_tools: Set[str] = set()
+            # Allocated on the first tool call; many sessions have none
+            session_tools: Optional[Set[str]] = None
             session_tool_count = 0
 
-            for turn in session.turns:
-                if turn.tool_calls:
-                    for tc in turn.tool_calls:
-                        name = tc.get("name", "")
-                        if name:
-                            all_tool_names.append(name)
-                            session_tools.add(name)
-                            session_tool_count += 1
-                            if any(name.startswith(p) for p in MCP_TOOL_PREFIXES):
-                                all_mcp_tools.append(name)
-
-                            # Track tool appropriateness
-                            if name in APPROPRIATE_FILE_TOOLS:
-                                file_mod_appropriate += 1
-                            if name in APPROPRIATE_READ_TOOLS:
-                                file_read_appropriate += 1
-                            if name == "Bash" or name == "run_terminal_command":
-                                args = tc.get("arguments", tc.get("input", ""))
-                                cmd = args if isinstance(args, str) else str(args)
-                                for pattern in INAPPROPRIATE_FILE_BASH_PATTERNS:
-                                    if re.search(pattern, cmd):
-                                        file_mod_inappropriate += 1
-                                        break
-                                for pattern in INAPPROPRIATE_READ_BASH_PATTERNS:
-                                    if re.search(pattern, cmd):
-                                        file_read_inappropriate += 1
-                                        break
-
-                if turn.role == "user" and turn.content:
-                    total_user_turns += 1
-                    for pattern in SLASH_COMMAND_PATTERNS:
-                        if re.search(pattern, turn.content, re.IGNORECASE):
-                            slash_command_count += 1
-                            break
-
-                    for pattern, category in AUTOMATION_OPPORTUNITY_PATTERNS:
-                        if re.search(pattern, turn.content, re.IGNORECASE):
-                            automation_misses[category] += 1
-
-            tools_per_session.append(session_tool_count)
-            unique_tools_per_session.append(len(session_tools))
+            for turn in session.actionable_turns:
+                for tc in turn.tool_calls:
+                    name = tc.name
+                    if not name:
+                        continue
+                    tool_counter[name] += 1
+                    if session_tools is None:
+                        session_tools = set()
+                    session_tools.add(name)
+                    session_tool_count += 1
+                    if name.startswith(MCP_TOOL_PREFIXES):
+                        mcp_counter[name] += 1
+                        mcp_tool_calls += 1
+
+                    # Track tool appropriateness
+                    role = TOOL_ROLES.get(name)
+                    if role is None:
+                        continue
+                    if role == "file_mod":
+                        file_mod_appropriate += 1
+                    elif role == "file_read":
+                        file_read_appropriate += 1
+                    else:
+                        args = tc.input or ""
+                        cmd = args if isinstance(args, str) else str(args)
+                        for pattern in INAPPROPRIATE_FILE_BASH_RES:
+                            if pattern.search(cmd):
+                                file_mod_inappropriate += 1
+                                break
+                        for pattern in INAPPROPRIATE_READ_BASH_RES:
+                            if pattern.search(cmd):
+                                file_read_inappropriate += 1
+                                break
+
+                # Only user prompts carry slash commands and automation signals
+                if turn.role != "user":
+                    continue
+                content = turn.content
+                if not content:
+                    continue
+                total_user_turns += 1
+                lowered = content.lower()
+                if USER_CONTENT_RE2 is not None and lowered.isascii():
+                    screened = USER_CONTENT_RE2.search(lowered)
+                else:
+                    screened = USER_CONTENT_RE.search(lowered)
+                if not screened:
+                    continue
+
+                # Every slash pattern needs a "/" or the literal phrase "slash command"
+                if "/" in content or "slash command" in lowered:
+                    if (
+                        content[:1] == "/" and LEADING_SLASH_COMMAND_RE.match(content)
+                    ) or INLINE_SLASH_COMMAND_RE.search(lowered):
+                        slash_command_count += 1
+
+                for pattern, category in AUTOMATION_OPPORTUNITY_RES:
+                    if pattern.search(lowered):
+                        automation_misses[category] += 1
+
+            total_tool_calls += session_tool_count
+            if session_tools is not None:
+                unique_tools_sum += len(session_tools)
 
         # Calculate metrics
-        tool_counter = Counter(all_tool_names)
         unique_tools_used = len(tool_counter)
-        total_tool_calls = len(all_tool_names)
-        mcp_tool_calls = len(all_mcp_tools)
-        unique_mcp_tools = len(set(all_mcp_tools))
+        unique_mcp_tools = len(mcp_counter)
         total_auto_misses = sum(automation_misses.values())
 
-        tool_type = sessions[0].tool.value if sessions else "claude_code"
-        builtin_set = BUILTIN_TOOLS.get(tool_type, BUILTIN_TOOLS["claude_code"])
-        builtin_used = {t for t in tool_counter if t in builtin_set}
-        builtin_coverage = len(builtin_used) / len(builtin_set) if builtin_set else 0
+        builtin_used_count = len(builtin_set & tool_counter.keys())
+        builtin_coverage = builtin_used_count / len(builtin_set) if builtin_set else 0
 
         miss_rate = total_auto_misses / total_user_turns if total_user_turns > 0 else 0
         slash_rate = slash_command_count / total_user_turns if total_user_turns > 0 else 0
@@ -177,8 +243,6 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
         else:
             appropriateness = 0.7  # neutral if no file operations detected
 
-        avg = lambda vals: sum(vals) / len(vals) if vals else 0
-
         # Smooth scoring: each dimension 0-1
         diversity_dim = (
             diminishing(unique_tools_used, 8) * 0.6
@@ -186,18 +250,13 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
         )
 
         # MCP: neutral if unconfigured
-        has_mcp_config = False
-        if rule_files:
-            for rf in rule_files:
-                if rf.file_type in ("mcp_config", "claude_user_mcp") and rf.exists:
-                    has_mcp_config = True
-                    break
+        has_mcp_config = any(
+            rf.exists and rf.file_type in MCP_CONFIG_FILE_TYPES for rf in rule_files or ()
+        )
         if not has_mcp_config:
             mcp_dim = 0.6  # neutral (15/25 equivalent)
         else:
-            mcp_dim = count_score(unique_mcp_tools, [
-                (0, 0.3), (1, 0.7), (2, 0.85), (3, 1.0),
-            ])
+            mcp_dim = count_score(unique_mcp_tools, MCP_TOOL_COUNT_SCORES)
 
         slash_dim = sigmoid(slash_rate, 0.05, 30)
         automation_dim = 1 - sigmoid(miss_rate, 0.08, 15)
@@ -211,8 +270,7 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
             (appropriateness_dim, 0.25),
         ])
 
-        period_start = min((s.start_time for s in sessions if s.start_time), default=None)
-        period_end = max((s.end_time for s in sessions if s.end_time), default=None)
+        period_start, period_end = self._period_bounds(sessions)
 
         return AnalysisResult(
             analyzer_key=self.get_key(),
@@ -228,8 +286,8 @@ class ToolUsageAnalyzer(BaseReflectAnalyzer):
                 "slash_command_rate": round(slash_rate, 3),
                 "automation_misses": total_auto_misses,
                 "tool_appropriateness": round(appropriateness, 3),
-                "avg_tools_per_session": round(avg(tools_per_session), 1),
-                "avg_unique_tools_per_session": round(avg(unique_tools_per_session), 1),
+                "avg_tools_per_session": round(total_tool_calls / len(sessions), 1),
+                "avg_unique_tools_per_session": round(unique_tools_sum / len(sessions), 1),
                 "top_tools": dict(tool_counter.most_common(10)),
             },
             insights=[],
@@ -14,11 +14,13 @@ Usage:
 import json
 import logging
 import sys
-from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict
 
 import click
 
-from sparkey_reflect.core.models import ToolType
+if TYPE_CHECKING:
+    from sparkey_reflect.core.models import ToolType
 
 
 def _setup_logging(verbose: bool):
@@ -30,17 +32,24 @@ def _setup_logging(verbose: bool):
     )
 
 
-def _resolve_tool(tool_str: str | None) -> ToolType | None:
-    if tool_str is None:
-        return None
-    mapping = {
+@lru_cache(maxsize=None)
+def _tool_aliases() -> "Dict[str, ToolType]":
+    """CLI spellings of each tool, built on first use."""
+    from sparkey_reflect.core.models import ToolType
+
+    return {
         "claude-code": ToolType.CLAUDE_CODE,
         "claude_code": ToolType.CLAUDE_CODE,
         "claude": ToolType.CLAUDE_CODE,
         "cursor": ToolType.CURSOR,
         "copilot": ToolType.COPILOT,
     }
-    result = mapping.get(tool_str.lower())
+
+
+def _resolve_tool(tool_str: str | None) -> "ToolType | None":
+    if tool_str is None:
+        return None
+    result = _tool_aliases().get(tool_str.lower())
     if result is None:
         raise click.BadParameter(
             f"Unknown tool: {tool_str}. Supported: claude-code, cursor, copilot"
@@ -347,11 +356,12 @@ def config(key, value):
         else:
             click.echo(f"{key} is not set")
     else:
+        cfg = storage.get_configs(["retention_days", "default_tool", "sync_enabled"])
         click.echo("\n  Sparkey Reflect Configuration")
         click.echo(f"  DB path: {storage.db_path}")
-        click.echo(f"  Retention: {storage.get_config('retention_days', '180')} days")
-        click.echo(f"  Default tool: {storage.get_config('default_tool', 'auto-detect')}")
-        click.echo(f"  Sync enabled: {storage.get_config('sync_enabled', 'false')}")
+        click.echo(f"  Retention: {cfg.get('retention_days', '180')} days")
+        click.echo(f"  Default tool: {cfg.get('default_tool', 'auto-detect')}")
+        click.echo(f"  Sync enabled: {cfg.get('sync_enabled', 'false')}")
         click.echo()
 
 
@@ -43,3 +43,5 @@ DEFAULT_MODEL = "claude-sonnet-4-6"
 MAX_OUTPUT_TOKENS = 16384
 CONTEXT_WINDOW_LIMIT = 180_000  # soft limit — only triggers summarization above this
 MAX_CODE_BLOCK_LINES = 5  # code blocks > this get truncated in extraction
+LLM_CACHE_DIR = DEFAULT_DB_DIR / "llm_cache"  # CLI responses keyed by prompt hash
+LLM_CACHE_TTL_SECONDS = 86400  # set REFLECT_NO_CACHE=1 to bypass
@@ -4,20 +4,24 @@ Reflect Engine
 Main orchestrator that ties readers, analyzers, storage, and insight generation together.
 """
 
+import atexit
+import importlib
 import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from sparkey_reflect.analyzers.base_analyzer import BaseReflectAnalyzer
-from sparkey_reflect.analyzers.completion_patterns import CompletionPatternsAnalyzer
-from sparkey_reflect.analyzers.context_management import ContextManagementAnalyzer
-from sparkey_reflect.analyzers.conversation_flow import ConversationFlowAnalyzer
-from sparkey_reflect.analyzers.outcome_tracker import OutcomeTrackerAnalyzer
-from sparkey_reflect.analyzers.prompt_quality import PromptQualityAnalyzer
-from sparkey_reflect.analyzers.registry import ReflectAnalyzerConfig, ReflectAnalyzerPresets
-from sparkey_reflect.analyzers.rule_file import RuleFileAnalyzer
-from sparkey_reflect.analyzers.session_patterns import SessionPatternsAnalyzer
-from sparkey_reflect.analyzers.tool_usage import ToolUsageAnalyzer
+from sparkey_reflect.analyzers.registry import (
+    ReflectAnalyzerConfig,
+    ReflectAnalyzerPresets,
+    ReflectAnalyzerRegistry,
+)
 from sparkey_reflect.core.models import (
     AnalysisResult,
     ReflectReport,
@@ -28,31 +32,46 @@ from sparkey_reflect.core.models import (
 from sparkey_reflect.core.storage import ReflectStorage
 from sparkey_reflect.insights.generator import InsightGenerator
 from sparkey_reflect.readers.base_reader import BaseReader
-from sparkey_reflect.readers.claude_code_reader import ClaudeCodeReader
-from sparkey_reflect.readers.copilot_reader import CopilotReader
-from sparkey_reflect.readers.cursor_reader import CursorReader
 
 logger = logging.getLogger(__name__)
 
-# Mapping of analyzer keys to their implementing classes
-ANALYZER_CLASSES: Dict[str, type] = {
-    "prompt_quality": PromptQualityAnalyzer,
-    "conversation_flow": ConversationFlowAnalyzer,
-    "session_patterns": SessionPatternsAnalyzer,
-    "context_management": ContextManagementAnalyzer,
-    "tool_usage": ToolUsageAnalyzer,
-    "rule_file": RuleFileAnalyzer,
-    "outcome_tracker": OutcomeTrackerAnalyzer,
-    "completion_patterns": CompletionPatternsAnalyzer,
+# Mapping of analyzer keys to their implementing classes ("module:Class").
+# Modules are imported on first use so a run only loads what it needs.
+ANALYZER_CLASSES: Dict[str, str] = {
+    "prompt_quality": "sparkey_reflect.analyzers.prompt_quality:PromptQualityAnalyzer",
+    "conversation_flow": "sparkey_reflect.analyzers.conversation_flow:ConversationFlowAnalyzer",
+    "session_patterns": "sparkey_reflect.analyzers.session_patterns:SessionPatternsAnalyzer",
+    "context_management": "sparkey_reflect.analyzers.context_management:ContextManagementAnalyzer",
+    "tool_usage": "sparkey_reflect.analyzers.tool_usage:ToolUsageAnalyzer",
+    "rule_file": "sparkey_reflect.analyzers.rule_file:RuleFileAnalyzer",
+    "outcome_tracker": "sparkey_reflect.analyzers.outcome_tracker:OutcomeTrackerAnalyzer",
+    "completion_patterns": "sparkey_reflect.analyzers.completion_patterns:CompletionPatternsAnalyzer",
 }
 
-# Mapping of tool types to reader classes
-READER_CLASSES: Dict[ToolType, type] = {
-    ToolType.CLAUDE_CODE: ClaudeCodeReader,
-    ToolType.CURSOR: CursorReader,
-    ToolType.COPILOT: CopilotReader,
+# Mapping of tool types to reader classes ("module:Class")
+READER_CLASSES: Dict[ToolType, str] = {
+    ToolType.CLAUDE_CODE: "sparkey_reflect.readers.claude_code_reader:ClaudeCodeReader",
+    ToolType.CURSOR: "sparkey_reflect.readers.cursor_reader:CursorReader",
+    ToolType.COPILOT: "sparkey_reflect.readers.copilot_reader:CopilotReader",
 }
 
+# Preset names, each a factory method on ReflectAnalyzerPresets
+PRESET_NAMES = frozenset({"quick", "coaching", "full", "copilot"})
+DEFAULT_PRESET = "coaching"
+
+# Reports waiting for the background writer before analyze() blocks
+PERSIST_QUEUE_SIZE = 16
+
+# Number of distinct session sets whose analyzer results are kept in memory
+RESULT_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=None)
+def _load_class(spec: str) -> type:
+    """Import and return the class named by a "module:Class" spec."""
+    module_path, class_name = spec.split(":")
+    return getattr(importlib.import_module(module_path), class_name)
+
 
 class ReflectEngine:
     """Main orchestrator for the Reflect analysis pipeline."""
@@ -62,12 +81,38 @@ class ReflectEngine:
         storage: Optional[ReflectStorage] = None,
         analyzer_config: Optional[ReflectAnalyzerConfig] = None,
         use_llm: bool = True,
+        eager_analyzers: bool = False,
+        background_persist: bool = False,
     ):
         self.storage = storage or ReflectStorage()
         self.analyzer_config = analyzer_config
         self.insight_generator = InsightGenerator(storage=self.storage, use_llm=use_llm)
         self._readers: Dict[ToolType, BaseReader] = {}
         self._analyzers: Dict[str, BaseReflectAnalyzer] = {}
+        self._result_cache: "OrderedDict[Tuple, Dict[str, AnalysisResult]]" = OrderedDict()
+
+        # Construct everything up front so repeated analyze() calls in a
+        # long-running process see no first-use setup cost.
+        if eager_analyzers:
+            for key in ANALYZER_CLASSES:
+                self._get_analyzer(key)
+            for tool_type in READER_CLASSES:
+                self._get_reader(tool_type)
+
+        # Optionally hand persistence to a writer thread so analyze() returns
+        # as soon as the report is built. Call flush() to wait for it, and
+        # close() to stop the thread when the engine is no longer needed.
+        self._persist_queue: Optional[
+            "queue.Queue[Optional[Tuple[ReflectReport, ToolType]]]"
+        ] = None
+        self._persist_thread: Optional[threading.Thread] = None
+        if background_persist:
+            self._persist_queue = queue.Queue(maxsize=PERSIST_QUEUE_SIZE)
+            self._persist_thread = threading.Thread(
+                target=self._persist_worker, name="reflect-persist", daemon=True
+            )
+            self._persist_thread.start()
+            atexit.register(self.flush)
 
     # =========================================================================
     # Public API
@@ -101,8 +146,8 @@ class ReflectEngine:
         config = self._resolve_config(preset, tool)
 
         # Read sessions
-        since = datetime.now(timezone.utc) - timedelta(days=days)
         until = datetime.now(timezone.utc)
+        since = until - timedelta(days=days)
         reader = self._get_reader(tool)
         sessions = reader.read_sessions(since=since, until=until, workspace_path=workspace_path)
         logger.info("Read %d sessions from %s", len(sessions), tool.value)
@@ -113,7 +158,7 @@ class ReflectEngine:
                 period_start=since,
                 period_end=until,
                 overall_score=0,
-                created_at=datetime.now(timezone.utc),
+                created_at=until,
             )
 
         # Read rule files
@@ -122,12 +167,18 @@ class ReflectEngine:
         # Run analyzers
         results = self._run_analyzers(sessions, rule_files, config)
 
-        # Compute session metadata
+        # Compute session metadata in a single pass
+        total_turns = total_tokens = 0
+        total_duration = 0
+        for s in sessions:
+            total_turns += len(s.turns)
+            total_tokens += s.total_input_tokens + s.total_output_tokens
+            total_duration += s.duration_minutes
         sessions_meta = {
             "session_count": len(sessions),
-            "total_turns": sum(s.turn_count for s in sessions),
-            "total_tokens": sum(s.total_tokens for s in sessions),
-            "total_duration_minutes": sum(s.duration_minutes for s in sessions),
+            "total_turns": total_turns,
+            "total_tokens": total_tokens,
+            "total_duration_minutes": total_duration,
         }
 
         # Generate report
@@ -142,7 +193,10 @@ class ReflectEngine:
         )
 
         # Persist results
-        self._persist(report, tool)
+        if self._persist_queue is not None:
+            self._persist_queue.put((report, tool))
+        else:
+            self._persist(report, tool)
 
         return report
 
@@ -159,11 +213,7 @@ class ReflectEngine:
 
     def get_status(self) -> List[Dict]:
         """Get availability status for all supported tools."""
-        statuses = []
-        for tool_type, reader_cls in READER_CLASSES.items():
-            reader = reader_cls()
-            statuses.append(reader.get_status())
-        return statuses
+        return [self._get_reader(tool_type).get_status() for tool_type in READER_CLASSES]
 
     def get_trends(
         self,
@@ -176,13 +226,29 @@ class ReflectEngine:
         if metric_key:
             return {metric_key: self.storage.get_trend(metric_key, tool_str, days)}
 
-        # Return all known analyzer trends
-        trends = {}
-        for key in ANALYZER_CLASSES:
-            trend_data = self.storage.get_trend(key, tool_str, days)
-            if trend_data:
-                trends[key] = trend_data
-        return trends
+        # Return all known analyzer trends, in registry order
+        found = self.storage.get_trends(list(ANALYZER_CLASSES), tool_str, days)
+        return {key: found[key] for key in ANALYZER_CLASSES if key in found}
+
+    def flush(self):
+        """Block until every queued report has been persisted."""
+        if self._persist_queue is not None:
+            self._persist_queue.join()
+
+    def close(self):
+        """Persist queued reports and stop the background writer.
+
+        Safe to call more than once; later analyze() calls persist inline.
+        The storage itself stays open, since callers may have passed it in.
+        """
+        if self._persist_queue is None:
+            return
+        # The writer handles everything queued ahead of the sentinel, then exits
+        self._persist_queue.put(None)
+        self._persist_thread.join()
+        self._persist_queue = None
+        self._persist_thread = None
+        atexit.unregister(self.flush)
 
     def get_latest_report(self, tool: Optional[ToolType] = None) -> Optional[Dict]:
         """Get the most recent saved report."""
@@ -195,9 +261,8 @@ class ReflectEngine:
 
     def _auto_detect_tool(self) -> ToolType:
         """Detect which AI tools are available and pick the best one."""
-        for tool_type, reader_cls in READER_CLASSES.items():
-            reader = reader_cls()
-            if reader.is_available():
+        for tool_type in READER_CLASSES:
+            if self._get_reader(tool_type).is_available():
                 return tool_type
         raise RuntimeError(
             "No AI coding tool data found. Supported tools: "
@@ -205,20 +270,22 @@ class ReflectEngine:
         )
 
     def _get_reader(self, tool: ToolType) -> BaseReader:
-        if tool not in self._readers:
-            reader_cls = READER_CLASSES.get(tool)
-            if not reader_cls:
+        reader = self._readers.get(tool)
+        if reader is None:
+            spec = READER_CLASSES.get(tool)
+            if not spec:
                 raise ValueError(f"No reader available for {tool.value}")
-            self._readers[tool] = reader_cls()
-        return self._readers[tool]
+            reader = self._readers[tool] = _load_class(spec)()
+        return reader
 
     def _get_analyzer(self, key: str) -> BaseReflectAnalyzer:
-        if key not in self._analyzers:
-            analyzer_cls = ANALYZER_CLASSES.get(key)
-            if not analyzer_cls:
+        analyzer = self._analyzers.get(key)
+        if analyzer is None:
+            spec = ANALYZER_CLASSES.get(key)
+            if not spec:
                 raise ValueError(f"Unknown analyzer: {key}")
-            self._analyzers[key] = analyzer_cls()
-        return self._analyzers[key]
+            analyzer = self._analyzers[key] = _load_class(spec)()
+        return analyzer
 
     def _resolve_config(
         self, preset: Optional[str], tool: ToolType
@@ -227,14 +294,8 @@ class ReflectEngine:
         if self.analyzer_config:
             return self.analyzer_config
 
-        preset_map = {
-            "quick": ReflectAnalyzerPresets.quick,
-            "coaching": ReflectAnalyzerPresets.coaching,
-            "full": ReflectAnalyzerPresets.full,
-            "copilot": ReflectAnalyzerPresets.copilot,
-        }
-        factory = preset_map.get(preset or "coaching", ReflectAnalyzerPresets.coaching)
-        return factory()
+        name = preset if preset in PRESET_NAMES else DEFAULT_PRESET
+        return getattr(ReflectAnalyzerPresets, name)()
 
     def _run_analyzers(
         self,
@@ -242,52 +303,138 @@ class ReflectEngine:
         rule_files: List[RuleFileInfo],
         config: ReflectAnalyzerConfig,
     ) -> List[AnalysisResult]:
-        """Run all enabled analyzers."""
-        results = []
+        """Run all enabled analyzers, reusing results for an identical input.
+
+        Analyzers only read their inputs, so uncached ones run concurrently;
+        results are returned in the configured order.
+        """
+        cached = self._get_cached_results(sessions, rule_files)
+        keys = []
         for key in config.get_enabled():
             if key not in ANALYZER_CLASSES:
                 logger.debug("Analyzer %s not yet implemented, skipping", key)
                 continue
+            keys.append(key)
+
+        pending = [key for key in keys if key not in cached]
+        futures = {}
+        if len(pending) > 1:
+            workers = min(len(pending), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for key in pending:
+                    # Resolved in the worker, so a failing constructor surfaces
+                    # through the future and only that analyzer is skipped
+                    futures[key] = executor.submit(
+                        self._run_analyzer, key, sessions, rule_files
+                    )
+
+        log_scores = logger.isEnabledFor(logging.INFO)
+        results = []
+        for key in keys:
             try:
-                analyzer = self._get_analyzer(key)
-                result = analyzer.analyze(sessions, rule_files)
+                result = cached.get(key)
+                if result is None:
+                    if key in futures:
+                        result = futures[key].result()
+                    else:
+                        result = self._run_analyzer(key, sessions, rule_files)
+                    # Git-backed analyzers depend on state outside the input
+                    definition = ReflectAnalyzerRegistry.get(key)
+                    if not (definition and definition.requires_git):
+                        cached[key] = result
                 results.append(result)
-                logger.info("  %s: score=%.1f", key, result.score)
+                if log_scores:
+                    logger.info("  %s: score=%.1f", key, result.score)
             except Exception as e:
                 logger.warning("Analyzer %s failed: %s", key, e)
         return results
 
-    def _persist(self, report: ReflectReport, tool: ToolType):
-        """Persist report, results, insights, and trend points."""
+    def _run_analyzer(
+        self, key: str, sessions: List[Session], rule_files: List[RuleFileInfo]
+    ) -> AnalysisResult:
+        """Construct (on first use) and run one analyzer."""
+        return self._get_analyzer(key).analyze(sessions, rule_files)
+
+    def _get_cached_results(
+        self,
+        sessions: List[Session],
+        rule_files: List[RuleFileInfo],
+    ) -> Dict[str, AnalysisResult]:
+        """Return the per-analyzer result cache for this input, creating it if new.
+
+        The fingerprint covers each session's id, turn count, and time bounds
+        plus the rule-file state, so re-reading a session that has grown since
+        the last run produces a miss.
+        """
+        fingerprint = (
+            tuple(
+                (s.session_id, len(s.turns), s.start_time, s.end_time)
+                for s in sessions
+            ),
+            tuple(
+                (rf.file_path, rf.exists, rf.word_count, rf.last_modified)
+                for rf in rule_files or []
+            ),
+        )
+        cached = self._result_cache.get(fingerprint)
+        if cached is not None:
+            self._result_cache.move_to_end(fingerprint)
+            return cached
+
+        cached = {}
+        self._result_cache[fingerprint] = cached
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return cached
+
+    def _persist_worker(self):
+        """Drain the persist queue; storage gives this thread its own connection."""
+        persist_queue = self._persist_queue
         try:
-            # Save report
-            self.storage.save_report(report)
-
-            # Save individual analysis results
-            for r in report.results:
-                self.storage.save_analysis_result(r, tool.value)
-
-            # Save insights
-            for insight in report.insights:
-                self.storage.save_insight(
-                    insight, tool.value,
-                    report.period_start, report.period_end,
-                )
+            while True:
+                item = persist_queue.get()
+                try:
+                    if item is None:
+                        return
+                    self._persist(*item)
+                finally:
+                    persist_queue.task_done()
+        finally:
+            # Connections are per thread; only this thread can close its own
+            self.storage.close()
 
-            # Save trend points
-            now = datetime.now(timezone.utc)
-            for r in report.results:
-                self.storage.save_trend_point(
-                    r.analyzer_key, r.score, tool.value, now, "daily"
+    def _persist(self, report: ReflectReport, tool: ToolType):
+        """Persist report, results, insights, and trend points in one transaction."""
+        if not report.results:
+            # Nothing was scored; an empty report would only add a zero
+            # point to the overall-score trend
+            logger.debug("No analyzer results, skipping persist")
+            return
+
+        storage = self.storage
+        try:
+            with storage.transaction():
+                # Save report
+                storage.save_report(report)
+
+                # Save individual analysis results
+                storage.save_analysis_results(report.results, tool.value)
+
+                # Save insights
+                if report.insights:
+                    storage.save_insights(
+                        report.insights, tool.value,
+                        report.period_start, report.period_end,
+                    )
+
+                # Save trend points, plus the aggregate overall score
+                # (we only save metadata, never raw turns)
+                points = [(r.analyzer_key, r.score) for r in report.results]
+                points.append(("overall_score", report.overall_score))
+                storage.save_trend_points(
+                    points, tool.value,
+                    report.created_at or datetime.now(timezone.utc), "daily",
                 )
 
-            # Save session metadata
-            # (we only save metadata, never raw turns)
-            # Session metadata is saved during read for deduplication,
-            # but we save aggregate here too
-            self.storage.save_trend_point(
-                "overall_score", report.overall_score, tool.value, now, "daily"
-            )
-
         except Exception as e:
             logger.warning("Error persisting results: %s", e)
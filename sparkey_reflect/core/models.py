@@ -4,10 +4,11 @@ Sparkey Reflect Data Models
 Core dataclasses and enums for the Reflect analysis engine.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 # =============================================================================
@@ -64,13 +65,26 @@ class TrendDirection(str, Enum):
 # Core Data Models
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
+class ToolCall:
+    """A tool invocation made by the assistant."""
+    name: str
+    id: str = ""
+    input: Any = None  # tool arguments, when the source records them
+
+    def __post_init__(self):
+        # A handful of tool names repeat across thousands of calls
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+
+
+@dataclass(slots=True)
 class ConversationTurn:
     """A single turn in an AI conversation."""
     role: str  # "user", "assistant", "system", "tool_use", "tool_result"
     content: str
     timestamp: Optional[datetime] = None
-    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    tool_calls: List[ToolCall] = field(default_factory=list)
     tool_name: Optional[str] = None  # for tool_use/tool_result turns
     input_tokens: int = 0
     output_tokens: int = 0
@@ -78,6 +92,11 @@ class ConversationTurn:
     has_error_context: bool = False
     has_code_snippet: bool = False
 
+    def __post_init__(self):
+        # Share one string per role instead of one per parsed JSON value
+        if type(self.role) is str:
+            self.role = sys.intern(self.role)
+
 
 @dataclass
 class Session:
@@ -104,20 +123,63 @@ class Session:
     def turn_count(self) -> int:
         return len(self.turns)
 
+    # Turn-derived counts and subsets are memoized per turn list: appending
+    # to or replacing `turns` changes the key, so they never go stale.
+
+    def _turn_memo(self, name: str, compute: Callable[[List[ConversationTurn]], Any]) -> Any:
+        """Return compute(turns), cached until the turn list changes."""
+        turns = self.turns
+        entry = self.__dict__.get(name)
+        if entry is None or entry[0] is not turns or entry[1] != len(turns):
+            entry = self.__dict__[name] = (turns, len(turns), compute(turns))
+        return entry[2]
+
+    @staticmethod
+    def _count_turns(turns: List[ConversationTurn]) -> Tuple[int, int, int]:
+        """(user turns, assistant turns, tool calls), counted in one pass."""
+        user = assistant = tools = 0
+        for t in turns:
+            if t.role == "user":
+                user += 1
+            elif t.role == "assistant":
+                assistant += 1
+            tools += len(t.tool_calls)
+        return user, assistant, tools
+
+    @property
+    def _turn_counts(self) -> Tuple[int, int, int]:
+        return self._turn_memo("_turn_counts_memo", self._count_turns)
+
     @property
     def user_turn_count(self) -> int:
-        return sum(1 for t in self.turns if t.role == "user")
+        return self._turn_counts[0]
 
     @property
     def assistant_turn_count(self) -> int:
-        return sum(1 for t in self.turns if t.role == "assistant")
+        return self._turn_counts[1]
 
     @property
     def tool_use_count(self) -> int:
-        return sum(len(t.tool_calls) for t in self.turns)
+        return self._turn_counts[2]
 
+    @property
+    def user_turns(self) -> List[ConversationTurn]:
+        """User turns that carry content."""
+        return self._turn_memo(
+            "_user_turns_memo",
+            lambda turns: [t for t in turns if t.role == "user" and t.content],
+        )
 
-@dataclass
+    @property
+    def actionable_turns(self) -> List[ConversationTurn]:
+        """Turns with tool calls or user content; the rest carry no signal for tool analysis."""
+        return self._turn_memo(
+            "_actionable_turns_memo",
+            lambda turns: [t for t in turns if t.tool_calls or (t.role == "user" and t.content)],
+        )
+
+
+@dataclass(slots=True)
 class CompletionEvent:
     """A code completion event (Copilot-specific)."""
     event_id: str
@@ -131,7 +193,7 @@ class CompletionEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleFileInfo:
     """Parsed rule/instruction file metadata."""
     file_path: str
@@ -154,13 +216,15 @@ class RuleFileInfo:
 # Analysis Output Models
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Output from a single analyzer for a set of sessions."""
     analyzer_key: str
     analyzer_name: str
     score: float  # 0-100 composite score
-    metrics: Dict[str, float] = field(default_factory=dict)
+    # JSON-ready values keyed by name: numbers, bools, and nested dicts such
+    # as tool_usage's top_tools; storage and the LLM prompt iterate it as-is
+    metrics: Dict[str, Any] = field(default_factory=dict)
     insights: List['ReflectInsight'] = field(default_factory=list)
     session_count: int = 0
     period_start: Optional[datetime] = None
@@ -168,7 +232,7 @@ class AnalysisResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ReflectInsight:
     """A coaching insight with actionable recommendation."""
     category: InsightCategory
@@ -195,7 +259,20 @@ class ReflectInsight:
         }
 
 
-@dataclass
+def _round_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Round numeric metric values to 2 places for serialization."""
+    out = {}
+    for k, v in metrics.items():
+        t = type(v)
+        if t is float:
+            v = round(v, 2)
+        elif t is not int and isinstance(v, (int, float)):
+            v = round(v, 2)  # bool and numeric subclasses
+        out[k] = v
+    return out
+
+
+@dataclass(slots=True)
 class ReflectReport:
     """Complete analysis report for a time period."""
     tool: ToolType
@@ -227,10 +304,7 @@ class ReflectReport:
                 {
                     "analyzer": r.analyzer_key,
                     "score": round(r.score, 1),
-                    "metrics": {
-                        k: round(v, 2) if isinstance(v, (int, float)) else v
-                        for k, v in r.metrics.items()
-                    },
+                    "metrics": _round_metrics(r.metrics),
                 }
                 for r in self.results
             ],
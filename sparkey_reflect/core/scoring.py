@@ -7,7 +7,7 @@ mathematical curves grounded in DORA, SPACE, DevEx, GitClear, and METR research.
 """
 
 import math
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 
 
 def sigmoid(x: float, midpoint: float, steepness: float = 1.0) -> float:
@@ -19,8 +19,15 @@ def sigmoid(x: float, midpoint: float, steepness: float = 1.0) -> float:
         steepness: Higher = sharper transition around midpoint.
     """
     z = -steepness * (x - midpoint)
-    # Clamp to avoid overflow
-    z = max(-500, min(500, z))
+    # Clamp to avoid overflow (branches are cheaper than max/min calls on
+    # this per-prompt path). NaN fails both comparisons; it clamps to 500,
+    # as max(-500, min(500, nan)) did.
+    if z > 500:
+        z = 500
+    elif z < -500:
+        z = -500
+    elif z != z:
+        z = 500
     return 1.0 / (1.0 + math.exp(z))
 
 
@@ -36,7 +43,8 @@ def bell(x: float, center: float, width: float) -> float:
     """
     if width == 0:
         return 1.0 if x == center else 0.0
-    return math.exp(-0.5 * ((x - center) / width) ** 2)
+    d = (x - center) / width
+    return math.exp(-0.5 * d * d)
 
 
 def linear_clamp(x: float, low: float, high: float) -> float:
@@ -65,22 +73,27 @@ def diminishing(x: float, scale: float = 1.0) -> float:
     """
     if scale <= 0:
         return 1.0
-    return min(1.0, math.sqrt(max(0, x) / scale))
+    if not x > 0:
+        return 0.0
+    r = math.sqrt(x / scale)
+    return r if r < 1.0 else 1.0
 
 
-def count_score(n: int, thresholds: List[Tuple[int, float]]) -> float:
+def count_score(n: int, thresholds: Sequence[Tuple[int, float]]) -> float:
     """Piecewise score for discrete counts.
 
     Args:
         n: Input count.
-        thresholds: List of (count, score) tuples. Returns highest score
-                    whose threshold is met.
+        thresholds: (count, score) tuples in any order. Returns the score
+                    of the highest threshold that is met.
     """
-    result = 0.0
-    for threshold, value in sorted(thresholds):
-        if n >= threshold:
-            result = value
-    return result
+    # Single pass for the largest met (count, score) pair -- the same pair
+    # a sort would leave last, without sorting on every call
+    best = None
+    for pair in thresholds:
+        if n >= pair[0] and (best is None or pair > best):
+            best = pair
+    return best[1] if best is not None else 0.0
 
 
 def weighted_sum(dimensions: List[Tuple[float, float]]) -> float:
@@ -90,7 +103,11 @@ def weighted_sum(dimensions: List[Tuple[float, float]]) -> float:
         dimensions: List of (score, weight) tuples where score is 0.0-1.0
                     and weight is the relative importance.
     """
-    total_w = sum(w for _, w in dimensions)
+    total_w = 0.0
+    total = 0.0
+    for s, w in dimensions:
+        total_w += w
+        total += s * w
     if total_w == 0:
         return 0.0
-    return 100.0 * sum(s * w for s, w in dimensions) / total_w
+    return 100.0 * total / total_w
@@ -7,10 +7,18 @@ Stores computed metrics, scores, trends -- never raw conversation text.
 
 import json
 import logging
+import math
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Tuple
+
+try:
+    import orjson  # optional: pip install sparkey-reflect[orjson]
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +26,131 @@ DEFAULT_DB_DIR = Path.home() / ".sparkey" / "reflect"
 DEFAULT_DB_PATH = DEFAULT_DB_DIR / "reflect.db"
 RETENTION_DAYS = 180
 
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Layout of datetime('now'), which fills the created_at columns
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _finite(obj: Any) -> Any:
+    """Replace NaN/inf with None, as orjson does, so both backends store null."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a metrics or report payload to JSON text.
+
+    orjson rejects some payloads the stdlib encodes (lone surrogates in
+    strings); those fall back to json rather than dropping the write.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(_finite(obj))
+
+
+def _created_cutoff(days: int) -> str:
+    """Cutoff for created_at range filters, in the column's own layout.
+
+    Comparing an isoformat() string ('T' separator) against datetime('now')
+    text (space separator) misorders rows from the cutoff day.
+    """
+    return (datetime.utcnow() - timedelta(days=days)).strftime(SQLITE_DATETIME_FORMAT)
+
 
 class ReflectStorage:
     """Local SQLite storage for Reflect analysis data."""
 
+    # Applied to every new connection. WAL with synchronous=NORMAL only
+    # fsyncs at checkpoints, which is plenty for a derived-metrics store.
+    PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "busy_timeout=5000",
+        "cache_size=-65536",  # 64 MB
+        "temp_store=MEMORY",
+        "mmap_size=268435456",  # 256 MB
+        "foreign_keys=ON",
+    )
+
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn: Optional[sqlite3.Connection] = None
+        # One connection (and transaction depth) per thread: sqlite3 objects
+        # cannot cross threads, and under WAL a reader on one connection never
+        # waits behind a writer on another
+        self._local = threading.local()
         self._ensure_schema()
 
     @property
     def conn(self) -> sqlite3.Connection:
-        if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path))
-            self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA journal_mode=WAL")
-            self._conn.execute("PRAGMA foreign_keys=ON")
-        return self._conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path), cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
+            self._local.conn = conn
+            self._local.tx_depth = 0
+        return conn
 
     def close(self):
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Group writes into one transaction; nested calls join the outer one.
+
+        immediate=True takes the write lock up front (BEGIN IMMEDIATE) so a
+        read-then-write transaction cannot deadlock against another writer.
+        """
+        conn = self.conn
+        local = self._local
+        if local.tx_depth:
+            local.tx_depth += 1
+            try:
+                yield conn
+            finally:
+                local.tx_depth -= 1
+            return
+        local.tx_depth = 1
+        try:
+            with conn:
+                if immediate and not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+        finally:
+            local.tx_depth = 0
+
+    def _iter_rows(self, sql: str, params: Sequence = (),
+                   raw: bool = False) -> Iterator[Any]:
+        """Yield each result row as a dict straight off the cursor.
+
+        raw=True yields plain tuples in SELECT order, skipping the per-row
+        sqlite3.Row and dict construction.
+        """
+        if raw:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            yield from cursor.execute(sql, params)
+            return
+        for row in self.conn.execute(sql, params):
+            yield dict(row)
 
     # =========================================================================
     # Schema
@@ -56,6 +166,9 @@ class ReflectStorage:
                     tool TEXT NOT NULL,
                     start_time TEXT,
                     end_time TEXT,
+                    -- Stored rather than generated from start/end: readers
+                    -- clamp negative spans to 0 and report 0 without both
+                    -- timestamps, and generated columns need SQLite 3.31+
                     duration_minutes REAL DEFAULT 0,
                     turn_count INTEGER DEFAULT 0,
                     user_turn_count INTEGER DEFAULT 0,
@@ -130,59 +243,112 @@ class ReflectStorage:
                 CREATE INDEX IF NOT EXISTS idx_session_tool ON session_metadata(tool);
                 CREATE INDEX IF NOT EXISTS idx_session_start ON session_metadata(start_time);
                 CREATE INDEX IF NOT EXISTS idx_analysis_period ON analysis_results(period_start, period_end);
-                CREATE INDEX IF NOT EXISTS idx_analysis_analyzer ON analysis_results(analyzer_key);
+                CREATE INDEX IF NOT EXISTS idx_analysis_analyzer_tool
+                    ON analysis_results(analyzer_key, tool, created_at);
                 CREATE INDEX IF NOT EXISTS idx_insights_category ON insights(category);
                 CREATE INDEX IF NOT EXISTS idx_insights_severity ON insights(severity);
-                CREATE INDEX IF NOT EXISTS idx_trends_metric ON trends(metric_key, measured_at);
+                CREATE INDEX IF NOT EXISTS idx_trends_metric_tool
+                    ON trends(metric_key, tool, measured_at);
                 CREATE INDEX IF NOT EXISTS idx_reports_period ON reports(period_start, period_end);
+
+                -- Retention sweeps filter on the timestamp alone
+                CREATE INDEX IF NOT EXISTS idx_session_created ON session_metadata(created_at);
+                CREATE INDEX IF NOT EXISTS idx_analysis_created ON analysis_results(created_at);
+                CREATE INDEX IF NOT EXISTS idx_insights_created ON insights(created_at);
+                CREATE INDEX IF NOT EXISTS idx_trends_measured ON trends(measured_at);
+
+                -- Superseded by the composite indexes above
+                DROP INDEX IF EXISTS idx_analysis_analyzer;
+                DROP INDEX IF EXISTS idx_trends_metric;
             """)
 
     # =========================================================================
     # Session Metadata
     # =========================================================================
 
+    # Upsert in place: OR REPLACE would delete the old row (and its index
+    # entries) and hand the session a fresh id on every re-save
+    _INSERT_SESSION_METADATA = """INSERT INTO session_metadata
+        (session_id, tool, start_time, end_time, duration_minutes,
+         turn_count, user_turn_count, tool_use_count,
+         total_input_tokens, total_output_tokens,
+         session_type, workspace_path, branch, model)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(session_id) DO UPDATE SET
+            tool = excluded.tool,
+            start_time = excluded.start_time,
+            end_time = excluded.end_time,
+            duration_minutes = excluded.duration_minutes,
+            turn_count = excluded.turn_count,
+            user_turn_count = excluded.user_turn_count,
+            tool_use_count = excluded.tool_use_count,
+            total_input_tokens = excluded.total_input_tokens,
+            total_output_tokens = excluded.total_output_tokens,
+            session_type = excluded.session_type,
+            workspace_path = excluded.workspace_path,
+            branch = excluded.branch,
+            model = excluded.model"""
+
+    @staticmethod
+    def _session_metadata_row(session) -> Tuple:
+        return (
+            session.session_id,
+            session.tool.value,
+            session.start_time.isoformat() if session.start_time else None,
+            session.end_time.isoformat() if session.end_time else None,
+            session.duration_minutes,
+            session.turn_count,
+            session.user_turn_count,
+            session.tool_use_count,
+            session.total_input_tokens,
+            session.total_output_tokens,
+            session.session_type.value,
+            session.workspace_path,
+            session.branch,
+            session.model,
+        )
+
     def save_session_metadata(self, session) -> int:
         """Save session metadata (never raw content)."""
-        from sparkey_reflect.core.models import Session
-
-        with self.conn:
-            cursor = self.conn.execute(
-                """INSERT OR REPLACE INTO session_metadata
-                   (session_id, tool, start_time, end_time, duration_minutes,
-                    turn_count, user_turn_count, tool_use_count,
-                    total_input_tokens, total_output_tokens,
-                    session_type, workspace_path, branch, model)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    session.session_id,
-                    session.tool.value,
-                    session.start_time.isoformat() if session.start_time else None,
-                    session.end_time.isoformat() if session.end_time else None,
-                    session.duration_minutes,
-                    session.turn_count,
-                    session.user_turn_count,
-                    session.tool_use_count,
-                    session.total_input_tokens,
-                    session.total_output_tokens,
-                    session.session_type.value,
-                    session.workspace_path,
-                    session.branch,
-                    session.model,
-                ),
+        with self.transaction():
+            self.conn.execute(
+                self._INSERT_SESSION_METADATA, self._session_metadata_row(session)
+            )
+            # lastrowid is not set when the upsert takes the UPDATE path
+            row = self.conn.execute(
+                "SELECT id FROM session_metadata WHERE session_id = ?",
+                (session.session_id,),
+            ).fetchone()
+            return row[0]
+
+    def save_sessions_metadata(self, sessions: Sequence):
+        """Save metadata for several sessions in one batched insert."""
+        with self.transaction():
+            self.conn.executemany(
+                self._INSERT_SESSION_METADATA,
+                [self._session_metadata_row(s) for s in sessions],
             )
-            return cursor.lastrowid
+
+    # Fixed statement text per filter combination, keyed by (tool, since)
+    _SESSION_COUNT_QUERIES = {
+        (False, False): "SELECT COUNT(*) FROM session_metadata",
+        (True, False): "SELECT COUNT(*) FROM session_metadata WHERE tool = ?",
+        (False, True): "SELECT COUNT(*) FROM session_metadata WHERE start_time >= ?",
+        (True, True): (
+            "SELECT COUNT(*) FROM session_metadata"
+            " WHERE tool = ? AND start_time >= ?"
+        ),
+    }
 
     def get_session_count(self, tool: Optional[str] = None,
                           since: Optional[datetime] = None) -> int:
         """Count sessions, optionally filtered."""
-        query = "SELECT COUNT(*) FROM session_metadata WHERE 1=1"
         params = []
         if tool:
-            query += " AND tool = ?"
             params.append(tool)
         if since:
-            query += " AND start_time >= ?"
             params.append(since.isoformat())
+        query = self._SESSION_COUNT_QUERIES[bool(tool), bool(since)]
         row = self.conn.execute(query, params).fetchone()
         return row[0] if row else 0
 
@@ -190,94 +356,167 @@ class ReflectStorage:
     # Analysis Results
     # =========================================================================
 
+    _INSERT_ANALYSIS_RESULT = """INSERT INTO analysis_results
+        (analyzer_key, score, metrics, session_count,
+         period_start, period_end, tool)
+        VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+    @staticmethod
+    def _analysis_result_row(result, tool: str) -> Tuple:
+        return (
+            result.analyzer_key,
+            result.score,
+            _dumps(result.metrics),
+            result.session_count,
+            result.period_start.isoformat() if result.period_start else "",
+            result.period_end.isoformat() if result.period_end else "",
+            tool,
+        )
+
     def save_analysis_result(self, result, tool: str) -> int:
         """Save an analysis result."""
-        with self.conn:
+        with self.transaction():
             cursor = self.conn.execute(
-                """INSERT INTO analysis_results
-                   (analyzer_key, score, metrics, session_count,
-                    period_start, period_end, tool)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    result.analyzer_key,
-                    result.score,
-                    json.dumps(result.metrics),
-                    result.session_count,
-                    result.period_start.isoformat() if result.period_start else "",
-                    result.period_end.isoformat() if result.period_end else "",
-                    tool,
-                ),
+                self._INSERT_ANALYSIS_RESULT,
+                self._analysis_result_row(result, tool),
             )
             return cursor.lastrowid
 
-    def get_latest_scores(self, tool: str, limit: int = 10) -> List[Dict]:
-        """Get most recent analysis scores grouped by analyzer."""
-        rows = self.conn.execute(
+    def save_analysis_results(self, results: Sequence, tool: str):
+        """Save several analysis results in one batched insert."""
+        with self.transaction():
+            self.conn.executemany(
+                self._INSERT_ANALYSIS_RESULT,
+                [self._analysis_result_row(r, tool) for r in results],
+            )
+
+    def get_latest_scores(self, tool: str, limit: int = 10,
+                          raw: bool = False) -> List[Any]:
+        """Get most recent analysis scores grouped by analyzer.
+
+        raw=True returns tuples in column order instead of dicts.
+        """
+        return list(self._iter_rows(
             """SELECT analyzer_key, score, metrics, period_start, period_end, created_at
                FROM analysis_results
                WHERE tool = ?
                ORDER BY created_at DESC
                LIMIT ?""",
             (tool, limit),
-        ).fetchall()
-        return [dict(r) for r in rows]
+            raw,
+        ))
 
     def get_score_history(self, analyzer_key: str, tool: str,
-                          days: int = 90) -> List[Dict]:
-        """Get score history for a specific analyzer."""
-        since = (datetime.utcnow() - timedelta(days=days)).isoformat()
-        rows = self.conn.execute(
+                          days: int = 90, raw: bool = False) -> List[Any]:
+        """Get score history for a specific analyzer.
+
+        raw=True returns tuples in column order instead of dicts.
+        """
+        since = _created_cutoff(days)
+        return list(self._iter_rows(
             """SELECT score, period_start, period_end, created_at
                FROM analysis_results
                WHERE analyzer_key = ? AND tool = ? AND created_at >= ?
                ORDER BY created_at ASC""",
             (analyzer_key, tool, since),
-        ).fetchall()
-        return [dict(r) for r in rows]
+            raw,
+        ))
+
+    def get_score_histories(self, analyzer_keys: Sequence[str], tool: str,
+                            days: int = 90) -> Dict[str, List[Dict]]:
+        """Get score history for several analyzers in one query.
+
+        Analyzers with no results in the window are omitted.
+        """
+        if not analyzer_keys:
+            return {}
+        since = _created_cutoff(days)
+        placeholders = ", ".join("?" for _ in analyzer_keys)
+        histories: Dict[str, List[Dict]] = {}
+        for key, score, period_start, period_end, created_at in self._iter_rows(
+            f"""SELECT analyzer_key, score, period_start, period_end, created_at
+                FROM analysis_results
+                WHERE analyzer_key IN ({placeholders}) AND tool = ? AND created_at >= ?
+                ORDER BY created_at ASC""",
+            (*analyzer_keys, tool, since),
+            raw=True,
+        ):
+            histories.setdefault(key, []).append({
+                "score": score,
+                "period_start": period_start,
+                "period_end": period_end,
+                "created_at": created_at,
+            })
+        return histories
 
     # =========================================================================
     # Insights
     # =========================================================================
 
+    _INSERT_INSIGHT = """INSERT INTO insights
+        (category, title, severity, recommendation, evidence,
+         metric_key, metric_value, trend, tool,
+         period_start, period_end)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    @staticmethod
+    def _insight_row(insight, tool: str, period_start: Optional[str],
+                     period_end: Optional[str]) -> Tuple:
+        return (
+            insight.category.value,
+            insight.title,
+            insight.severity.value,
+            insight.recommendation,
+            insight.evidence,
+            insight.metric_key,
+            insight.metric_value,
+            insight.trend.value,
+            tool,
+            period_start,
+            period_end,
+        )
+
     def save_insight(self, insight, tool: str,
                      period_start: Optional[datetime] = None,
                      period_end: Optional[datetime] = None) -> int:
         """Save a coaching insight."""
-        with self.conn:
+        with self.transaction():
             cursor = self.conn.execute(
-                """INSERT INTO insights
-                   (category, title, severity, recommendation, evidence,
-                    metric_key, metric_value, trend, tool,
-                    period_start, period_end)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    insight.category.value,
-                    insight.title,
-                    insight.severity.value,
-                    insight.recommendation,
-                    insight.evidence,
-                    insight.metric_key,
-                    insight.metric_value,
-                    insight.trend.value,
-                    tool,
+                self._INSERT_INSIGHT,
+                self._insight_row(
+                    insight, tool,
                     period_start.isoformat() if period_start else None,
                     period_end.isoformat() if period_end else None,
                 ),
             )
             return cursor.lastrowid
 
+    def save_insights(self, insights: Sequence, tool: str,
+                      period_start: Optional[datetime] = None,
+                      period_end: Optional[datetime] = None):
+        """Save several insights for the same period in one batched insert."""
+        start = period_start.isoformat() if period_start else None
+        end = period_end.isoformat() if period_end else None
+        with self.transaction():
+            self.conn.executemany(
+                self._INSERT_INSIGHT,
+                [self._insight_row(i, tool, start, end) for i in insights],
+            )
+
     def get_recent_insights(self, tool: str, limit: int = 20,
                             severity: Optional[str] = None) -> List[Dict]:
         """Get recent insights, optionally filtered by severity."""
-        query = "SELECT * FROM insights WHERE tool = ?"
-        params: List[Any] = [tool]
         if severity:
-            query += " AND severity = ?"
-            params.append(severity)
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-        rows = self.conn.execute(query, params).fetchall()
-        return [dict(r) for r in rows]
+            return list(self._iter_rows(
+                """SELECT * FROM insights WHERE tool = ? AND severity = ?
+                   ORDER BY created_at DESC LIMIT ?""",
+                (tool, severity, limit),
+            ))
+        return list(self._iter_rows(
+            """SELECT * FROM insights WHERE tool = ?
+               ORDER BY created_at DESC LIMIT ?""",
+            (tool, limit),
+        ))
 
     # =========================================================================
     # Reports
@@ -285,7 +524,7 @@ class ReflectStorage:
 
     def save_report(self, report) -> int:
         """Save a complete report."""
-        with self.conn:
+        with self.transaction():
             cursor = self.conn.execute(
                 """INSERT INTO reports
                    (tool, period_start, period_end, overall_score,
@@ -301,7 +540,7 @@ class ReflectStorage:
                     report.total_turns,
                     report.total_tokens,
                     report.total_duration_minutes,
-                    json.dumps(report.to_dict()),
+                    _dumps(report.to_dict()),
                 ),
             )
             return cursor.lastrowid
@@ -315,16 +554,20 @@ class ReflectStorage:
         ).fetchone()
         return dict(row) if row else None
 
-    def get_report_history(self, tool: str, limit: int = 12) -> List[Dict]:
-        """Get report history for trend comparison."""
-        rows = self.conn.execute(
+    def get_report_history(self, tool: str, limit: int = 12,
+                           raw: bool = False) -> List[Any]:
+        """Get report history for trend comparison.
+
+        raw=True returns tuples in column order instead of dicts.
+        """
+        return list(self._iter_rows(
             """SELECT id, tool, period_start, period_end, overall_score,
                       session_count, total_turns, created_at
                FROM reports WHERE tool = ?
                ORDER BY period_end DESC LIMIT ?""",
             (tool, limit),
-        ).fetchall()
-        return [dict(r) for r in rows]
+            raw,
+        ))
 
     # =========================================================================
     # Trends
@@ -334,26 +577,62 @@ class ReflectStorage:
                          tool: str, measured_at: datetime,
                          period_type: str = "daily"):
         """Save a single trend data point."""
-        with self.conn:
-            self.conn.execute(
+        self.save_trend_points([(metric_key, value)], tool, measured_at, period_type)
+
+    def save_trend_points(self, points: Sequence[Tuple[str, float]],
+                          tool: str, measured_at: datetime,
+                          period_type: str = "daily"):
+        """Save (metric_key, value) trend points sharing one timestamp."""
+        measured = measured_at.isoformat()
+        with self.transaction():
+            self.conn.executemany(
                 """INSERT INTO trends
                    (metric_key, metric_value, tool, measured_at, period_type)
                    VALUES (?, ?, ?, ?, ?)""",
-                (metric_key, value, tool, measured_at.isoformat(), period_type),
+                [(key, value, tool, measured, period_type) for key, value in points],
             )
 
     def get_trend(self, metric_key: str, tool: str,
-                  days: int = 30) -> List[Dict]:
-        """Get trend data for a metric."""
+                  days: int = 30, raw: bool = False) -> List[Any]:
+        """Get trend data for a metric.
+
+        raw=True returns tuples in column order instead of dicts.
+        """
         since = (datetime.utcnow() - timedelta(days=days)).isoformat()
-        rows = self.conn.execute(
+        return list(self._iter_rows(
             """SELECT metric_value, measured_at, period_type
                FROM trends
                WHERE metric_key = ? AND tool = ? AND measured_at >= ?
                ORDER BY measured_at ASC""",
             (metric_key, tool, since),
+            raw,
+        ))
+
+    def get_trends(self, metric_keys: Sequence[str], tool: str,
+                   days: int = 30) -> Dict[str, List[Dict]]:
+        """Get trend data for several metrics in one query.
+
+        Metrics with no points in the window are omitted.
+        """
+        if not metric_keys:
+            return {}
+        since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        placeholders = ", ".join("?" for _ in metric_keys)
+        rows = self.conn.execute(
+            f"""SELECT metric_key, metric_value, measured_at, period_type
+                FROM trends
+                WHERE metric_key IN ({placeholders}) AND tool = ? AND measured_at >= ?
+                ORDER BY measured_at ASC""",
+            (*metric_keys, tool, since),
         ).fetchall()
-        return [dict(r) for r in rows]
+        trends: Dict[str, List[Dict]] = {}
+        for r in rows:
+            trends.setdefault(r["metric_key"], []).append({
+                "metric_value": r["metric_value"],
+                "measured_at": r["measured_at"],
+                "period_type": r["period_type"],
+            })
+        return trends
 
     # =========================================================================
     # Config
@@ -366,9 +645,19 @@ class ReflectStorage:
         ).fetchone()
         return row[0] if row else default
 
+    def get_configs(self, keys: List[str]) -> Dict[str, str]:
+        """Get several config values in one query. Unset keys are omitted."""
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        rows = self.conn.execute(
+            f"SELECT key, value FROM config WHERE key IN ({placeholders})", keys
+        ).fetchall()
+        return {r[0]: r[1] for r in rows}
+
     def set_config(self, key: str, value: str):
         """Set a config value."""
-        with self.conn:
+        with self.transaction():
             self.conn.execute(
                 """INSERT OR REPLACE INTO config (key, value, updated_at)
                    VALUES (?, ?, datetime('now'))""",
@@ -381,13 +670,16 @@ class ReflectStorage:
 
     def cleanup_old_data(self, retention_days: int = RETENTION_DAYS):
         """Remove data older than retention period."""
-        cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat()
-        with self.conn:
-            for table, col in [
-                ("session_metadata", "created_at"),
-                ("analysis_results", "created_at"),
-                ("insights", "created_at"),
-                ("trends", "measured_at"),
+        # One clock read, rendered in each column's layout
+        cutoff_at = datetime.utcnow() - timedelta(days=retention_days)
+        created = cutoff_at.strftime(SQLITE_DATETIME_FORMAT)
+        measured = cutoff_at.isoformat()
+        with self.transaction(immediate=True):
+            for table, col, cutoff in [
+                ("session_metadata", "created_at", created),
+                ("analysis_results", "created_at", created),
+                ("insights", "created_at", created),
+                ("trends", "measured_at", measured),
             ]:
                 self.conn.execute(
                     f"DELETE FROM {table} WHERE {col} < ?", (cutoff,)
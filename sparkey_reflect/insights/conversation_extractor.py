@@ -8,26 +8,71 @@ preserving user prompts, assistant reasoning, tool call names, and error message
 
 import re
 from dataclasses import dataclass, field
+from itertools import chain, islice
 from typing import Any, Dict, List, Optional
 
 from sparkey_reflect.core.models import Session
 
 
 # Patterns for detecting content that should be stripped
+CODE_BLOCK_PATTERN = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
 DIFF_PATTERN = re.compile(r'^[\+\-]{3}\s|^@@\s', re.MULTILINE)
 BASE64_PATTERN = re.compile(r'[A-Za-z0-9+/]{100,}={0,2}')
-FILE_LISTING_PATTERN = re.compile(
-    r'(?:^[ \t]*(?:[-d][-rwx]{9}|total \d+).*\n?){5,}', re.MULTILINE
-)
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
 
 # Patterns for detecting reflect analysis sessions (should be excluded)
 REFLECT_SESSION_MARKERS = [
     "You are Sparkey Reflect",
     "sparkey_reflect analyze",
 ]
-
-
-@dataclass
+# Contained in every marker, so a single scan clears an ordinary turn
+REFLECT_MARKER_SENTINEL = "parkey"
+
+
+def _is_listing_line(line: str) -> bool:
+    """True for an `ls -l` row: permission bits or a 'total N' header."""
+    s = line.lstrip(" \t")
+    if s[:1] in ("-", "d") and len(s) >= 10:
+        for c in s[1:10]:
+            if c not in "-rwx":
+                return False
+        return True
+    return s[:6] == "total " and s[6:7].isdecimal()
+
+
+def _collapse_file_listings(content: str) -> str:
+    """Replace runs of 5+ consecutive listing lines with a summary.
+
+    A line-by-line scan: linear in the content, with no regex backtracking
+    across repeated lines.
+    """
+    lines = content.split("\n")
+    n = len(lines)
+    out = []
+    i = 0
+    while i < n:
+        if not _is_listing_line(lines[i]):
+            out.append(lines[i])
+            i += 1
+            continue
+        j = i + 1
+        while j < n and _is_listing_line(lines[j]):
+            j += 1
+        if j - i < 5:
+            out.extend(lines[i:j])
+            i = j
+            continue
+        if j == n:
+            out.append(f"[file listing: {j - i} entries]")
+        else:
+            # The summary swallows the run's trailing newline (counted as an
+            # entry) and runs straight into the following line
+            out.append(f"[file listing: {j - i + 1} entries]{lines[j]}")
+        i = j + 1
+    return "\n".join(out)
+
+
+@dataclass(slots=True)
 class ExtractedTurn:
     """A cleaned conversation turn."""
     role: str
@@ -35,7 +80,7 @@ class ExtractedTurn:
     tool_calls: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedSession:
     """A cleaned session summary for LLM consumption."""
     session_id: str
@@ -85,39 +130,46 @@ class ConversationExtractor:
 
     def estimate_tokens(self, extracted: List[ExtractedSession]) -> int:
         """Estimate token count using ~4 chars per token heuristic."""
-        total_chars = 0
-        for es in extracted:
-            total_chars += len(es.session_id or "")
-            total_chars += len(es.workspace or "")
-            for turn in es.turns:
-                total_chars += len(turn.content)
-                total_chars += sum(len(tc) for tc in turn.tool_calls)
-        return total_chars // 4
+        return sum(map(self.count_chars, extracted)) // 4
+
+    @staticmethod
+    def count_chars(es: ExtractedSession) -> int:
+        """Characters of one session that count toward the token estimate."""
+        turns = es.turns
+        return (
+            len(es.session_id or "") + len(es.workspace or "")
+            + sum(map(len, [t.content for t in turns]))
+            + sum(map(len, [tc for t in turns for tc in t.tool_calls]))
+        )
 
     def to_prompt_text(self, extracted: List[ExtractedSession]) -> str:
         """Format extracted sessions as readable text for the LLM prompt."""
         parts = []
+        append = parts.append
+        # "**ROLE**: " prefixes, built once per distinct role
+        prefixes: Dict[str, str] = {}
         for es in extracted:
-            header = f"### Session: {es.session_id[:12]}"
+            header = [f"### Session: {es.session_id[:12]}"]
             if es.timestamp:
-                header += f" | {es.timestamp}"
+                header.append(es.timestamp)
             if es.workspace:
                 # Show just the last path component
-                ws_short = es.workspace.rstrip("/").rsplit("/", 1)[-1]
-                header += f" | {ws_short}"
+                header.append(es.workspace.rstrip("/").rsplit("/", 1)[-1])
             if es.session_type:
-                header += f" | {es.session_type}"
+                header.append(es.session_type)
             if es.duration_minutes:
-                header += f" | {es.duration_minutes:.0f}min"
-            parts.append(header)
+                header.append(f"{es.duration_minutes:.0f}min")
+            append(" | ".join(header))
 
             for turn in es.turns:
-                role_label = turn.role.upper()
-                parts.append(f"**{role_label}**: {turn.content}")
+                prefix = prefixes.get(turn.role)
+                if prefix is None:
+                    prefix = prefixes[turn.role] = f"**{turn.role.upper()}**: "
+                append(prefix + turn.content)
                 if turn.tool_calls:
-                    parts.append(f"  Tools: {', '.join(turn.tool_calls)}")
+                    append(f"  Tools: {', '.join(turn.tool_calls)}")
 
-            parts.append("")  # blank line between sessions
+            append("")  # blank line between sessions
         return "\n".join(parts)
 
     # =========================================================================
@@ -128,6 +180,8 @@ class ConversationExtractor:
         """Detect sessions that are reflect analysis runs (should be excluded)."""
         for turn in session.turns[:5]:  # check only the first few turns
             content = turn.content or ""
+            if REFLECT_MARKER_SENTINEL not in content:
+                continue
             for marker in REFLECT_SESSION_MARKERS:
                 if marker in content:
                     return True
@@ -151,10 +205,15 @@ class ConversationExtractor:
         if len(turns) > self.max_turns_per_session:
             keep_start = 10
             keep_end = 10
-            middle = turns[keep_start:-keep_end] if keep_end else turns[keep_start:]
-            step = max(1, len(middle) // (self.max_turns_per_session - keep_start - keep_end))
-            sampled_middle = middle[::step]
-            turns = list(turns[:keep_start]) + list(sampled_middle) + list(turns[-keep_end:])
+            middle_end = max(keep_start, len(turns) - keep_end)
+            budget = self.max_turns_per_session - keep_start - keep_end
+            step = max(1, (middle_end - keep_start) // budget)
+            # Walk the kept ranges in place rather than copying and concatenating slices
+            turns = chain(
+                islice(turns, keep_start),
+                islice(turns, keep_start, middle_end, step),
+                turns[-keep_end:],
+            )
 
         for turn in turns:
             extracted_turn = self._extract_turn(turn)
@@ -177,7 +236,7 @@ class ConversationExtractor:
         if not content.strip():
             # Still capture tool calls even with empty content
             if turn.tool_calls:
-                tool_names = [tc.get("name", "unknown") for tc in turn.tool_calls]
+                tool_names = [tc.name for tc in turn.tool_calls]
                 return ExtractedTurn(
                     role=turn.role,
                     content="[tool calls only]",
@@ -197,7 +256,7 @@ class ConversationExtractor:
 
         tool_names = []
         if turn.tool_calls:
-            tool_names = [tc.get("name", "unknown") for tc in turn.tool_calls]
+            tool_names = [tc.name for tc in turn.tool_calls]
 
         return ExtractedTurn(
             role=turn.role,
@@ -207,23 +266,27 @@ class ConversationExtractor:
 
     def _clean_content(self, content: str, role: str) -> str:
         """Clean content by stripping large code blocks, diffs, binary data."""
+        # Each stage is skipped when a substring scan shows it has nothing to do
+
         # Strip large code blocks
-        content = self._strip_code_blocks(content)
+        if "```" in content:
+            content = self._strip_code_blocks(content)
 
-        # Strip diffs/patches
-        content = self._strip_diffs(content)
+        # Strip diffs/patches (only file headers open a diff summary)
+        if "--- " in content or "+++ " in content:
+            content = self._strip_diffs(content)
 
-        # Strip base64/binary content
-        content = BASE64_PATTERN.sub("[binary content omitted]", content)
+        # Strip base64/binary content (100+ chars)
+        if len(content) >= 100:
+            content = BASE64_PATTERN.sub("[binary content omitted]", content)
 
-        # Strip large file listings
-        content = FILE_LISTING_PATTERN.sub(
-            lambda m: f"[file listing: {m.group().count(chr(10)) + 1} entries]",
-            content,
-        )
+        # Summarize large file listings (5+ lines)
+        if content.count("\n") >= 4:
+            content = _collapse_file_listings(content)
 
         # Collapse multiple blank lines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        if "\n\n\n" in content:
+            content = BLANK_LINES_PATTERN.sub('\n\n', content)
 
         return content.strip()
 
@@ -238,12 +301,7 @@ class ConversationExtractor:
             lang_label = lang.strip() if lang.strip() else "code"
             return f"[code: {lang_label}, {line_count} lines]"
 
-        return re.sub(
-            r'```(\w*)\n(.*?)```',
-            replace_block,
-            content,
-            flags=re.DOTALL,
-        )
+        return CODE_BLOCK_PATTERN.sub(replace_block, content)
 
     def _strip_diffs(self, content: str) -> str:
         """Replace inline diffs/patches with summaries."""
@@ -258,24 +316,27 @@ class ConversationExtractor:
         removed = 0
 
         for line in lines:
-            if line.startswith("--- ") or line.startswith("+++ "):
+            # Classify by prefix slices rather than repeated startswith calls
+            head = line[:4]
+            if head == "--- " or head == "+++ ":
                 if not in_diff:
                     in_diff = True
                     added = 0
                     removed = 0
-                if line.startswith("+++ "):
+                if head == "+++ ":
                     diff_file = line[4:].strip()
                 continue
 
             if in_diff:
-                if line.startswith("@@"):
-                    continue
-                if line.startswith("+"):
+                first = head[:1]
+                if first == "+":
                     added += 1
                     continue
-                if line.startswith("-"):
+                if first == "-":
                     removed += 1
                     continue
+                if head[:2] == "@@":
+                    continue
                 # End of diff hunk
                 if diff_file or added or removed:
                     file_label = diff_file or "file"
@@ -7,6 +7,9 @@ recommendations. Numeric scoring stays local; insights come from Claude.
 
 import logging
 from datetime import datetime, timezone
+from itertools import islice
+from operator import mul
+from statistics import fmean
 from typing import Dict, List, Optional
 
 from sparkey_reflect.core.models import (
@@ -21,7 +24,6 @@ from sparkey_reflect.core.models import (
     ToolType,
 )
 from sparkey_reflect.core.storage import ReflectStorage
-from sparkey_reflect.insights.llm_generator import LLMInsightGenerator
 from sparkey_reflect.insights.templates import (
     DAILY_DIGEST_TEMPLATE,
     REPORT_FOOTER,
@@ -44,6 +46,30 @@ ANALYZER_WEIGHTS = {
     "rule_file": 0.05,            # unchanged — optional
     "completion_patterns": 0.15,  # Copilot-only, renormalized at runtime
 }
+# Weight for analyzers not listed above
+DEFAULT_ANALYZER_WEIGHT = 0.1
+
+# Digest score bars: every in-range bar at the default width, prebuilt
+SCORE_BAR_WIDTH = 20
+_SCORE_BARS = tuple(
+    "[" + "#" * n + "." * (SCORE_BAR_WIDTH - n) + "]" for n in range(SCORE_BAR_WIDTH + 1)
+)
+
+# Digest arrow for each trend direction
+_TREND_ARROWS = {
+    "improving": "^", "declining": "v", "stable": "=", "insufficient_data": "?"
+}
+
+# History window, in days, that trends compare against
+TREND_WINDOW_DAYS = 30
+
+# Display order of insights by severity
+SEVERITY_ORDER = {
+    InsightSeverity.CRITICAL: 0,
+    InsightSeverity.WARNING: 1,
+    InsightSeverity.SUGGESTION: 2,
+    InsightSeverity.INFO: 3,
+}
 
 
 class InsightGenerator:
@@ -56,7 +82,16 @@ class InsightGenerator:
     ):
         self.storage = storage
         self.use_llm = use_llm
-        self._llm_generator = LLMInsightGenerator() if use_llm else None
+        # Built on first use, so digest-only callers never load the LLM stack
+        self._llm_generator = None
+
+    @property
+    def llm_generator(self):
+        """The LLM insight generator, constructed on first access."""
+        if self._llm_generator is None:
+            from sparkey_reflect.insights.llm_generator import LLMInsightGenerator
+            self._llm_generator = LLMInsightGenerator()
+        return self._llm_generator
 
     def generate_report(
         self,
@@ -86,40 +121,42 @@ class InsightGenerator:
         # Compute weighted overall score
         overall_score = self._compute_overall_score(results)
 
-        # Compute trends if storage is available
+        # Compute trends if storage is available, from one history query
         trends = {}
-        if self.storage:
+        if self.storage and results:
+            histories = self.storage.get_score_histories(
+                [r.analyzer_key for r in results], tool.value, days=TREND_WINDOW_DAYS
+            )
             for r in results:
-                trend = self._compute_trend(r.analyzer_key, r.score, tool.value)
-                trends[r.analyzer_key] = trend
+                trends[r.analyzer_key] = self._trend_from_history(
+                    histories.get(r.analyzer_key, []), r.score
+                )
 
         # Generate insights via LLM (or return empty if disabled)
         all_insights = []
         overall_assessment = None
-        if self.use_llm and self._llm_generator and sessions:
-            llm_data = self._llm_generator.generate_insights(
+        if self.use_llm and sessions:
+            llm = self.llm_generator
+            llm_data = llm.generate_insights(
                 results=results,
                 sessions=sessions,
                 rule_files=rule_files,
                 trends=trends,
             )
-            all_insights = self._llm_generator.parse_insights(llm_data)
+            all_insights = llm.parse_insights(llm_data)
             overall_assessment = llm_data.get("overall_assessment")
 
-        # Enrich insights with trend info
+        # Enrich insights with trend info, bucketing them by severity as we go
+        # (a stable O(n) sort: critical first, then warnings, suggestions, info)
+        now = datetime.now(timezone.utc)
+        ranked = [[] for _ in range(len(SEVERITY_ORDER) + 1)]
+        unranked = len(SEVERITY_ORDER)
         for insight in all_insights:
             if insight.metric_key and insight.metric_key in trends:
                 insight.trend = trends[insight.metric_key]
-            insight.created_at = datetime.now(timezone.utc)
-
-        # Sort insights: critical first, then warnings, suggestions, info
-        severity_order = {
-            InsightSeverity.CRITICAL: 0,
-            InsightSeverity.WARNING: 1,
-            InsightSeverity.SUGGESTION: 2,
-            InsightSeverity.INFO: 3,
-        }
-        all_insights.sort(key=lambda i: severity_order.get(i.severity, 99))
+            insight.created_at = now
+            ranked[SEVERITY_ORDER.get(insight.severity, unranked)].append(insight)
+        all_insights = [i for bucket in ranked for i in bucket]
 
         meta = sessions_meta or {}
         report = ReflectReport(
@@ -135,7 +172,7 @@ class InsightGenerator:
             total_duration_minutes=meta.get("total_duration_minutes", 0),
             trends=trends,
             overall_assessment=overall_assessment,
-            created_at=datetime.now(timezone.utc),
+            created_at=now,
         )
 
         return report
@@ -153,9 +190,7 @@ class InsightGenerator:
 
         trends_lines = []
         for key, direction in report.trends.items():
-            arrow = {
-                "improving": "^", "declining": "v", "stable": "=", "insufficient_data": "?"
-            }.get(direction.value, "?")
+            arrow = _TREND_ARROWS.get(direction.value, "?")
             trends_lines.append(f"  {arrow} {key}: {direction.value}")
 
         assessment_section = ""
@@ -204,13 +239,12 @@ class InsightGenerator:
 
     def _compute_overall_score(self, results: List[AnalysisResult]) -> float:
         """Compute weighted overall score."""
-        weighted_sum = 0.0
-        weight_sum = 0.0
-        for r in results:
-            weight = ANALYZER_WEIGHTS.get(r.analyzer_key, 0.1)
-            weighted_sum += r.score * weight
-            weight_sum += weight
-        return weighted_sum / weight_sum if weight_sum > 0 else 0
+        get_weight = ANALYZER_WEIGHTS.get
+        weights = [get_weight(r.analyzer_key, DEFAULT_ANALYZER_WEIGHT) for r in results]
+        weight_sum = sum(weights)
+        if weight_sum <= 0:
+            return 0
+        return sum(map(mul, [r.score for r in results], weights)) / weight_sum
 
     def _compute_trend(self, analyzer_key: str, current_score: float,
                        tool: str) -> TrendDirection:
@@ -218,13 +252,17 @@ class InsightGenerator:
         if not self.storage:
             return TrendDirection.INSUFFICIENT_DATA
 
-        history = self.storage.get_score_history(analyzer_key, tool, days=30)
+        history = self.storage.get_score_history(analyzer_key, tool, days=TREND_WINDOW_DAYS)
+        return self._trend_from_history(history, current_score)
+
+    @staticmethod
+    def _trend_from_history(history: List[Dict], current_score: float) -> TrendDirection:
+        """Classify the current score against the analyzer's recent history."""
         if len(history) < 3:
             return TrendDirection.INSUFFICIENT_DATA
 
         # Compare current to average of older entries
-        older_scores = [h["score"] for h in history[:-1]]
-        avg_older = sum(older_scores) / len(older_scores)
+        avg_older = fmean(h["score"] for h in islice(history, len(history) - 1))
         diff = current_score - avg_older
 
         if diff > 5:
@@ -233,7 +271,9 @@ class InsightGenerator:
             return TrendDirection.DECLINING
         return TrendDirection.STABLE
 
-    def _score_bar(self, score: float, width: int = 20) -> str:
+    def _score_bar(self, score: float, width: int = SCORE_BAR_WIDTH) -> str:
         """Generate a text-based score bar."""
         filled = int(score / 100 * width)
+        if width == SCORE_BAR_WIDTH and 0 <= filled <= width:
+            return _SCORE_BARS[filled]
         return "[" + "#" * filled + "." * (width - filled) + "]"
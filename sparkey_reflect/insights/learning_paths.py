@@ -10,6 +10,12 @@ from typing import Any, Dict, List, Optional
 from sparkey_reflect.core.models import AnalysisResult
 from sparkey_reflect.insights.templates import LEARNING_PATH_TEMPLATE
 
+# Deficits below this many points read as "Close" rather than a gap
+CLOSE_DEFICIT = 20
+
+# (icon, status) per deficit bucket: on track, close, gap
+_STATUS_TABLE = (("+", "On track"), ("~", "Close"), ("!", "Gap"))
+
 
 @dataclass
 class SkillArea:
@@ -32,6 +38,12 @@ class LearningPathBuilder:
         enriched with analyzer scores.
         """
         score_map = {r.analyzer_key: r.score for r in results}
+        # Exact-name index: each analyzer key and its leading word
+        # ("prompt_quality" and "prompt"); the first analyzer claiming a name wins
+        alias_index: Dict[str, float] = {}
+        for ak, av in score_map.items():
+            alias_index.setdefault(ak, av)
+            alias_index.setdefault(ak.split("_", 1)[0], av)
         skill_areas = []
 
         for item in llm_data.get("learning_path", []):
@@ -39,13 +51,15 @@ class LearningPathBuilder:
             recs = item.get("recommendations", [])
             level = item.get("current_level", "intermediate")
 
-            # Try to find a matching score
-            score = 0.0
+            # Try to find a matching score: exact name first, then the
+            # first analyzer whose key contains or is contained in the name
             key = name.lower().replace(" ", "_")
-            for ak, av in score_map.items():
-                if ak in key or key in ak:
-                    score = av
-                    break
+            score = alias_index.get(key)
+            if score is None:
+                score = next(
+                    (av for ak, av in score_map.items() if ak in key or key in ak),
+                    0.0,
+                )
 
             target = 75.0
             deficit = max(0, target - score)
@@ -87,15 +101,11 @@ class LearningPathBuilder:
 
         priority_lines = []
         for i, area in enumerate(skill_areas, 1):
-            if area.deficit <= 0:
-                icon = "+"
-                status = "On track"
-            elif area.deficit < 20:
-                icon = "~"
-                status = "Close"
-            else:
-                icon = "!"
-                status = f"Gap: {area.deficit:.0f} pts"
+            deficit = area.deficit
+            bucket = 0 if deficit <= 0 else 1 if deficit < CLOSE_DEFICIT else 2
+            icon, status = _STATUS_TABLE[bucket]
+            if bucket == 2:
+                status = f"{status}: {deficit:.0f} pts"
             level_str = f" [{area.current_level}]" if area.current_level else ""
             priority_lines.append(
                 f"  {i}. {icon} {area.name:<25} "
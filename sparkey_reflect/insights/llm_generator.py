@@ -7,14 +7,25 @@ cleaned conversation data to Claude.
 Authentication: Claude Code CLI (`claude --print`) using existing OAuth session.
 """
 
+import hashlib
 import json
 import logging
+import math
 import os
 import shutil
 import subprocess
+import tempfile
+import time
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson  # optional: pip install sparkey-reflect[orjson]
+except ImportError:
+    orjson = None
+
 from sparkey_reflect.core.models import (
     AnalysisResult,
     InsightCategory,
@@ -33,7 +44,7 @@ _PROMPT_DIR = Path(__file__).parent / "prompts"
 _SYSTEM_PROMPT_PATH = _PROMPT_DIR / "reflect_system_prompt.md"
 
 # Category string -> enum mapping
-_CATEGORY_MAP = {
+_CATEGORY_MAP = MappingProxyType({
     "prompt_engineering": InsightCategory.PROMPT_ENGINEERING,
     "conversation_flow": InsightCategory.CONVERSATION_FLOW,
     "context_management": InsightCategory.CONTEXT_MANAGEMENT,
@@ -42,14 +53,100 @@ _CATEGORY_MAP = {
     "session_habits": InsightCategory.SESSION_HABITS,
     "outcome_quality": InsightCategory.OUTCOME_QUALITY,
     "completion_usage": InsightCategory.COMPLETION_USAGE,
-}
+})
 
-_SEVERITY_MAP = {
+_SEVERITY_MAP = MappingProxyType({
     "info": InsightSeverity.INFO,
     "suggestion": InsightSeverity.SUGGESTION,
     "warning": InsightSeverity.WARNING,
     "critical": InsightSeverity.CRITICAL,
-}
+})
+
+# Newest sessions kept in the prompt even when they overrun the budget
+MIN_PROMPT_SESSIONS = 5
+
+
+class _Budget:
+    """Character allowance for the user prompt (~4 chars per token)."""
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, token_limit: int):
+        self.remaining = token_limit * 4
+
+    def write(self, parts: List[str], text: str, force: bool = False) -> bool:
+        """Append text if it fits (or is forced); once one misses, all later ones do."""
+        cost = len(text) + 1  # plus the newline that joins it to the next part
+        if cost > self.remaining and not force:
+            self.remaining = 0
+            return False
+        self.remaining = max(0, self.remaining - cost)
+        parts.append(text)
+        return True
+
+
+# Parses a leading JSON value and reports where it ended
+_DECODER = json.JSONDecoder()
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON text; orjson's decode error subclasses json.JSONDecodeError."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _finite(obj: Any) -> Any:
+    """NaN/inf -> None, matching orjson's null for non-finite floats."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON for prompt text; both backends render the same string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Lone surrogates: escape them so the prompt stays encodable
+            return json.dumps(_finite(obj), separators=(",", ":"))
+    return json.dumps(_finite(obj), separators=(",", ":"), ensure_ascii=False)
+
+
+def _unwrap_cli_output(stdout: str) -> Optional[str]:
+    """Pull the model's reply out of the CLI's `--output-format json` envelope.
+
+    Output that is not an envelope (older CLIs print the bare reply) is
+    returned as is; an envelope flagged as an error yields None.
+    """
+    if not stdout.startswith("{"):
+        return stdout
+    try:
+        envelope = _loads(stdout)
+    except ValueError:
+        return stdout
+    if not isinstance(envelope, dict) or "insights" in envelope:
+        return stdout
+    inner = envelope.get("result")
+    if inner is None:
+        inner = envelope.get("content")
+    if not isinstance(inner, str):
+        return stdout
+    if envelope.get("is_error"):
+        logger.warning("Claude CLI reported an error: %s", inner[:500])
+        return None
+    return inner.strip()
+
+
+@lru_cache(maxsize=4)
+def _read_prompt_file(path: str) -> str:
+    """Read a packaged prompt once per process; every generator shares it."""
+    return Path(path).read_text()
 
 
 def _find_claude_cli() -> Optional[str]:
@@ -68,14 +165,37 @@ class LLMInsightGenerator:
         model: Optional[str] = None,
         max_output_tokens: int = 16384,
         context_window_limit: int = 180_000,
+        cache_dir: Optional[Path] = None,
+        cache_ttl_seconds: Optional[int] = None,
+        use_cache: bool = True,
     ):
-        from sparkey_reflect.config.defaults import DEFAULT_MODEL
+        """
+        Args:
+            cache_dir: Where CLI responses are cached; defaults to LLM_CACHE_DIR.
+            cache_ttl_seconds: Cache entry lifetime; defaults to LLM_CACHE_TTL_SECONDS.
+            use_cache: False disables the response cache for this instance.
+                Users turn it off with REFLECT_NO_CACHE=1, which wins over
+                both cache arguments.
+        """
+        from sparkey_reflect.config.defaults import (
+            DEFAULT_MODEL,
+            LLM_CACHE_DIR,
+            LLM_CACHE_TTL_SECONDS,
+        )
 
         self.model = model or os.environ.get("REFLECT_MODEL") or DEFAULT_MODEL
         self.max_output_tokens = max_output_tokens
         self.context_window_limit = context_window_limit
         self.extractor = ConversationExtractor()
-        self._system_prompt: Optional[str] = None
+        # Responses are cached on disk so re-running a report over unchanged
+        # data skips the CLI round trip; cache_dir None means no caching
+        if not use_cache or os.environ.get("REFLECT_NO_CACHE") == "1":
+            self.cache_dir: Optional[Path] = None
+        else:
+            self.cache_dir = cache_dir or LLM_CACHE_DIR
+        self.cache_ttl_seconds = (
+            LLM_CACHE_TTL_SECONDS if cache_ttl_seconds is None else cache_ttl_seconds
+        )
 
     def generate_insights(
         self,
@@ -95,23 +215,40 @@ class LLMInsightGenerator:
         system_prompt = self._load_system_prompt()
         user_prompt = self._build_user_prompt(results, sessions, rule_files, trends)
 
-        raw_text = self._call_via_cli(system_prompt, user_prompt)
+        cache_key = self._cache_key(system_prompt, user_prompt)
+        raw_text = self._read_cache(cache_key)
         if raw_text is not None:
-            return self._parse_response(raw_text)
+            data = self._extract_insights(raw_text)
+            if data is not None:
+                return data
 
-        return self._fallback_response(
-            "Claude Code CLI not available. Install Claude Code and run 'claude auth login'."
-        )
+        raw_text = self._call_via_cli(system_prompt, user_prompt)
+        if raw_text is None:
+            return self._fallback_response(
+                "Claude Code CLI not available. Install Claude Code and run 'claude auth login'."
+            )
+
+        # Only well-formed replies are cached; a garbled one is not replayed
+        data = self._extract_insights(raw_text)
+        if data is None:
+            return self._wrap_raw_response(raw_text)
+        self._write_cache(cache_key, raw_text)
+        return data
 
     def parse_insights(self, llm_data: Dict[str, Any]) -> List[ReflectInsight]:
         """Convert parsed LLM response into ReflectInsight objects."""
         insights = []
+        category_map = _CATEGORY_MAP
+        severity_map = _SEVERITY_MAP
         for item in llm_data.get("insights", []):
-            category = _CATEGORY_MAP.get(
-                item.get("category", ""), InsightCategory.PROMPT_ENGINEERING
+            # Normalize once so "Prompt_Engineering " still maps to its category
+            category = category_map.get(
+                str(item.get("category") or "").strip().lower(),
+                InsightCategory.PROMPT_ENGINEERING,
             )
-            severity = _SEVERITY_MAP.get(
-                item.get("severity", ""), InsightSeverity.SUGGESTION
+            severity = severity_map.get(
+                str(item.get("severity") or "").strip().lower(),
+                InsightSeverity.SUGGESTION,
             )
             insights.append(ReflectInsight(
                 category=category,
@@ -141,28 +278,32 @@ class LLMInsightGenerator:
             env = os.environ.copy()
             env.pop("CLAUDECODE", None)
 
-            result = subprocess.run(
-                [
-                    claude_bin,
-                    "--print",
-                    "--output-format", "json",
-                    "--system-prompt", system_prompt,
-                    "--no-session-persistence",
-                    "--model", self.model,
-                    "--allowedTools", "",
-                ],
-                input=user_prompt,
-                capture_output=True,
-                text=True,
-                timeout=timeout_secs,
-                env=env,
-            )
+            # The prompt can run to hundreds of KB: hand the CLI a file to read
+            # as stdin instead of feeding a pipe from Python
+            with tempfile.TemporaryFile() as prompt_file:
+                prompt_file.write(user_prompt.encode("utf-8"))
+                prompt_file.seek(0)
+                result = subprocess.run(
+                    [
+                        claude_bin,
+                        "--print",
+                        "--output-format", "json",
+                        "--system-prompt", system_prompt,
+                        "--no-session-persistence",
+                        "--model", self.model,
+                        "--allowedTools", "",
+                    ],
+                    stdin=prompt_file,
+                    capture_output=True,
+                    timeout=timeout_secs,
+                    env=env,
+                )
             if result.returncode != 0:
-                stderr = result.stderr.strip()
+                stderr = result.stderr.decode("utf-8", "replace").strip()
                 logger.warning("Claude CLI exited with code %d: %s", result.returncode, stderr[:500])
                 return None
 
-            raw_text = result.stdout.strip()
+            raw_text = _unwrap_cli_output(result.stdout.decode("utf-8").strip())
             if not raw_text:
                 logger.warning("Claude CLI returned empty output")
                 return None
@@ -176,19 +317,67 @@ class LLMInsightGenerator:
             logger.warning("Failed to run Claude CLI: %s", e)
             return None
 
+    # =========================================================================
+    # Response Cache
+    # =========================================================================
+
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """Hash of everything that determines the CLI response."""
+        payload = "\0".join((self.model, system_prompt, user_prompt))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _read_cache(self, key: str) -> Optional[str]:
+        """Return a cached raw response younger than the TTL, if any."""
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime >= self.cache_ttl_seconds:
+                path.unlink()
+                return None
+            raw_text = json.loads(path.read_text())["response"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        logger.info("Using cached LLM insights")
+        return raw_text
+
+    def _write_cache(self, key: str, raw_text: str):
+        """Store a raw response; the rename makes the write atomic."""
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_cache()
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"model": self.model, "response": raw_text}, f)
+            os.replace(tmp, self.cache_dir / f"{key}.json")
+        except OSError as e:
+            logger.debug("Could not write LLM cache entry: %s", e)
+
+    def _prune_cache(self):
+        """Delete entries (and abandoned temp files) older than the TTL."""
+        cutoff = time.time() - self.cache_ttl_seconds
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
     # =========================================================================
     # Prompt Construction
     # =========================================================================
 
     def _load_system_prompt(self) -> str:
         """Load the system prompt from the markdown file."""
-        if self._system_prompt is None:
-            try:
-                self._system_prompt = _SYSTEM_PROMPT_PATH.read_text()
-            except FileNotFoundError:
-                logger.warning("System prompt file not found at %s", _SYSTEM_PROMPT_PATH)
-                self._system_prompt = "You are an AI coding advisor. Analyze the developer's AI usage and provide actionable insights as JSON."
-        return self._system_prompt
+        try:
+            return _read_prompt_file(str(_SYSTEM_PROMPT_PATH))
+        except FileNotFoundError:
+            logger.warning("System prompt file not found at %s", _SYSTEM_PROMPT_PATH)
+            return "You are an AI coding advisor. Analyze the developer's AI usage and provide actionable insights as JSON."
 
     def _build_user_prompt(
         self,
@@ -197,99 +386,108 @@ class LLMInsightGenerator:
         rule_files: Optional[List[RuleFileInfo]],
         trends: Optional[Dict[str, TrendDirection]],
     ) -> str:
-        """Build the user prompt with scores, conversations, rules, and trends."""
-        parts = []
+        """Build the user prompt with scores, conversations, rules, and trends.
 
-        # Section 1: Analyzer scores
-        parts.append("## Analyzer Scores\n")
+        Every section draws on one character budget sized from the context
+        window, and stops adding blocks once the budget runs out.
+        """
+        parts: List[str] = []
+        budget = _Budget(self.context_window_limit)
+        self._build_scores(parts, budget, results)
+        self._build_trends(parts, budget, trends)
+        self._build_rules(parts, budget, rule_files)
+        self._build_conversations(parts, budget, sessions)
+        return "\n".join(parts)
+
+    def _build_scores(self, parts: List[str], budget: _Budget, results: List[AnalysisResult]):
+        """Section 1: analyzer scores, one block per analyzer."""
+        if not budget.write(parts, "## Analyzer Scores\n"):
+            return
         for r in results:
-            parts.append(f"### {r.analyzer_name} (key: {r.analyzer_key})")
-            parts.append(f"Score: {r.score:.1f}/100")
+            block = [f"### {r.analyzer_name} (key: {r.analyzer_key})", f"Score: {r.score:.1f}/100"]
             if r.metrics:
-                metrics_str = ", ".join(
-                    f"{k}={v}" for k, v in r.metrics.items()
-                    if not isinstance(v, dict)
-                )
-                if metrics_str:
-                    parts.append(f"Metrics: {metrics_str}")
-                # Include nested dicts (like task_type_distribution)
+                # One pass: scalars go on the Metrics line, nested dicts
+                # (like task_type_distribution) on their own lines after it
+                scalars = []
+                nested = []
                 for k, v in r.metrics.items():
                     if isinstance(v, dict):
-                        parts.append(f"{k}: {json.dumps(v)}")
-            parts.append("")
-
-        # Section 2: Trends
-        if trends:
-            parts.append("## Trends\n")
-            for key, direction in trends.items():
-                parts.append(f"- {key}: {direction.value}")
-            parts.append("")
-
-        # Section 3: Rule files
-        if rule_files:
-            parts.append("## Rule Files\n")
-            for rf in rule_files:
-                status = "exists" if rf.exists else "MISSING"
-                parts.append(f"### {rf.file_type} ({status})")
-                if rf.exists:
-                    parts.append(f"Words: {rf.word_count}, Sections: {rf.section_count}")
-                    flags = []
-                    if rf.has_examples:
-                        flags.append("has_examples")
-                    if rf.has_constraints:
-                        flags.append("has_constraints")
-                    if rf.has_project_context:
-                        flags.append("has_project_context")
-                    if rf.has_style_guide:
-                        flags.append("has_style_guide")
-                    if flags:
-                        parts.append(f"Features: {', '.join(flags)}")
-                    if rf.raw_content:
-                        content_preview = rf.raw_content[:3000]
-                        if len(rf.raw_content) > 3000:
-                            content_preview += f"\n... (truncated, {rf.word_count} words total)"
-                        parts.append(f"Content:\n```\n{content_preview}\n```")
-                parts.append("")
-
-        # Section 4: Conversations
-        extracted = self.extractor.extract(sessions)
-        estimated_tokens = self.extractor.estimate_tokens(extracted)
-
-        if estimated_tokens > self.context_window_limit:
-            extracted = self._trim_sessions(extracted, sessions)
-
-        if extracted:
-            parts.append("## Conversation History\n")
-            parts.append(self.extractor.to_prompt_text(extracted))
-
-        return "\n".join(parts)
-
-    def _trim_sessions(
-        self,
-        extracted,
-        sessions: List[Session],
-    ) -> list:
-        """Trim extracted sessions to fit within context window.
-
-        Keeps the most recent sessions verbatim and drops older ones.
+                        nested.append(f"{k}: {_dumps(v)}")
+                    else:
+                        scalars.append(f"{k}={v}")
+                if scalars:
+                    block.append(f"Metrics: {', '.join(scalars)}")
+                block.extend(nested)
+            block.append("")
+            if not budget.write(parts, "\n".join(block)):
+                return
+
+    def _build_trends(
+        self, parts: List[str], budget: _Budget, trends: Optional[Dict[str, TrendDirection]]
+    ):
+        """Section 2: trend direction per analyzer."""
+        if not trends:
+            return
+        lines = ["## Trends\n"]
+        lines.extend(f"- {key}: {direction.value}" for key, direction in trends.items())
+        lines.append("")
+        budget.write(parts, "\n".join(lines))
+
+    def _build_rules(
+        self, parts: List[str], budget: _Budget, rule_files: Optional[List[RuleFileInfo]]
+    ):
+        """Section 3: rule files, with a preview of each one's content."""
+        if not rule_files or not budget.write(parts, "## Rule Files\n"):
+            return
+        for rf in rule_files:
+            status = "exists" if rf.exists else "MISSING"
+            block = [f"### {rf.file_type} ({status})"]
+            if rf.exists:
+                block.append(f"Words: {rf.word_count}, Sections: {rf.section_count}")
+                flags = []
+                if rf.has_examples:
+                    flags.append("has_examples")
+                if rf.has_constraints:
+                    flags.append("has_constraints")
+                if rf.has_project_context:
+                    flags.append("has_project_context")
+                if rf.has_style_guide:
+                    flags.append("has_style_guide")
+                if flags:
+                    block.append(f"Features: {', '.join(flags)}")
+                if rf.raw_content:
+                    content_preview = rf.raw_content[:3000]
+                    if len(rf.raw_content) > 3000:
+                        content_preview += f"\n... (truncated, {rf.word_count} words total)"
+                    block.append(f"Content:\n```\n{content_preview}\n```")
+            block.append("")
+            if not budget.write(parts, "\n".join(block)):
+                return
+
+    def _build_conversations(self, parts: List[str], budget: _Budget, sessions: List[Session]):
+        """Section 4: conversations, newest first until the budget is spent.
+
+        The newest MIN_PROMPT_SESSIONS sessions are always included so the
+        model has something to coach on. When every session fits they keep
+        their input order; otherwise the kept ones are emitted oldest first.
         """
+        extracted = self.extractor.extract(sessions)
         if not extracted:
-            return extracted
-
-        sorted_extracted = sorted(
-            extracted,
-            key=lambda es: es.timestamp or "",
-        )
-
-        keep_count = max(5, len(sorted_extracted) // 3)
-        trimmed = sorted_extracted[-keep_count:]
-
-        estimated = self.extractor.estimate_tokens(trimmed)
-        while estimated > self.context_window_limit and len(trimmed) > 5:
-            trimmed = trimmed[1:]  # drop oldest
-            estimated = self.extractor.estimate_tokens(trimmed)
-
-        return trimmed
+            return
+        # Stable ascending sort walked backwards: ties keep their input order
+        order = sorted(range(len(extracted)), key=lambda i: extracted[i].timestamp or "")
+
+        budget.write(parts, "## Conversation History\n", force=True)
+        texts: Dict[int, str] = {}
+        scratch: List[str] = []
+        for rank, i in enumerate(reversed(order)):
+            text = self.extractor.to_prompt_text([extracted[i]])
+            if not budget.write(scratch, text, force=rank < MIN_PROMPT_SESSIONS):
+                break
+            texts[i] = text
+        if len(texts) == len(extracted):
+            order = range(len(extracted))
+        parts.append("\n".join(texts[i] for i in order if i in texts))
 
     # =========================================================================
     # Response Parsing
@@ -297,26 +495,42 @@ class LLMInsightGenerator:
 
     def _parse_response(self, raw_text: str) -> Dict[str, Any]:
         """Parse the LLM JSON response, with fallback for malformed output."""
+        data = self._extract_insights(raw_text)
+        if data is None:
+            return self._wrap_raw_response(raw_text)
+        return data
+
+    def _extract_insights(self, raw_text: str) -> Optional[Dict[str, Any]]:
+        """The response as a dict with an 'insights' key, or None if it is not one."""
         text = raw_text.strip()
 
-        # Handle markdown code blocks
+        # Common case: a bare JSON object, possibly followed by stray text
+        if text.startswith("{"):
+            try:
+                data, _ = _DECODER.raw_decode(text)
+            except ValueError:
+                pass
+            else:
+                if isinstance(data, dict) and "insights" in data:
+                    return data
+
+        # Handle markdown code blocks: drop the opening fence line and a
+        # closing fence line, slicing in place rather than splitting lines
         if text.startswith("```"):
-            lines = text.split("\n")
-            if lines[0].startswith("```"):
-                lines = lines[1:]
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-            text = "\n".join(lines)
+            first_nl = text.find("\n")
+            text = text[first_nl + 1:] if first_nl != -1 else ""
+            last_nl = text.rfind("\n")
+            if text[last_nl + 1:].strip() == "```":
+                text = text[:last_nl] if last_nl != -1 else ""
 
         try:
-            data = json.loads(text)
+            data = _loads(text)
             if isinstance(data, dict) and "insights" in data:
                 return data
             logger.warning("LLM response missing 'insights' key, wrapping as raw")
-            return self._wrap_raw_response(raw_text)
         except json.JSONDecodeError:
             logger.warning("Failed to parse LLM response as JSON")
-            return self._wrap_raw_response(raw_text)
+        return None
 
     def _wrap_raw_response(self, raw_text: str) -> Dict[str, Any]:
         """Wrap unparseable LLM output as a single insight."""
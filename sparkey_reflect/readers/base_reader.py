@@ -5,16 +5,33 @@ Abstract base class for AI tool conversation readers.
 Each tool-specific reader implements data extraction from its native storage.
 """
 
+import dataclasses
+import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from sparkey_reflect.core.models import RuleFileInfo, Session, ToolType
 
+# How long a memoized history range is trusted. Appending to an existing
+# session file does not touch its directory's mtime, so the directory stamp
+# alone cannot see a newer "latest" timestamp.
+HISTORY_CACHE_TTL_SECONDS = 30.0
+
 
 class BaseReader(ABC):
     """Abstract reader for AI tool conversation data."""
 
+    def __init__(self):
+        # (path, file_type) -> ((mtime_ns, size), parsed info)
+        self._rule_file_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], RuleFileInfo]] = {}
+        # (monotonic time, data location mtimes, range) from the last scan
+        self._history_cache: Optional[
+            Tuple[float, Tuple[Optional[int], ...], Optional[Tuple[datetime, datetime]]]
+        ] = None
+
     @abstractmethod
     def get_tool_type(self) -> ToolType:
         """Return the tool type this reader handles."""
@@ -68,14 +85,72 @@ class BaseReader(ABC):
             List of RuleFileInfo objects describing each config file found.
         """
 
+    @abstractmethod
+    def _read_rule_file(self, path: Path, file_type: str) -> RuleFileInfo:
+        """Read and analyze a single rule/config file."""
+
+    def _load_rule_file(self, path: Path, file_type: str) -> RuleFileInfo:
+        """Read a rule file, reusing the parsed result while it is unchanged on disk."""
+        try:
+            st = path.stat()
+        except OSError:
+            return self._read_rule_file(path, file_type)
+
+        key = (str(path), file_type)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._rule_file_cache.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self._read_rule_file(path, file_type))
+            self._rule_file_cache[key] = cached
+        # Hand out a copy so callers cannot alter the cached entry; replace()
+        # is shallow, so the sections list needs its own copy
+        info = cached[1]
+        return dataclasses.replace(info, sections=list(info.sections))
+
+    def cached_get_history_range(
+        self, locations: Optional[List[str]] = None,
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """get_history_range(), reused while the data locations look unchanged.
+
+        A memoized range is dropped once it is older than
+        HISTORY_CACHE_TTL_SECONDS, when any data location's mtime changes
+        (files added or removed), or on invalidate().
+        """
+        if locations is None:
+            locations = self.get_data_locations()
+        stamp = tuple(self._mtime_ns(loc) for loc in locations)
+        now = time.monotonic()
+        cached = self._history_cache
+        if (
+            cached is not None
+            and cached[1] == stamp
+            and now - cached[0] < HISTORY_CACHE_TTL_SECONDS
+        ):
+            return cached[2]
+        history = self.get_history_range()
+        self._history_cache = (now, stamp, history)
+        return history
+
+    def invalidate(self):
+        """Forget the memoized history range so the next call rescans."""
+        self._history_cache = None
+
+    @staticmethod
+    def _mtime_ns(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
     def get_status(self) -> dict:
         """Return a summary of tool data availability."""
         available = self.is_available()
-        history = self.get_history_range() if available else None
+        locations = self.get_data_locations() if available else []
+        history = self.cached_get_history_range(locations) if available else None
         return {
             "tool": self.get_tool_type().value,
             "available": available,
-            "data_locations": self.get_data_locations() if available else [],
+            "data_locations": locations,
             "earliest_data": history[0].isoformat() if history else None,
             "latest_data": history[1].isoformat() if history else None,
         }
@@ -17,15 +17,22 @@ Each JSONL file is one conversation session. Each line is a message entry with:
 import json
 import logging
 import re
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+try:
+    import orjson  # optional: pip install sparkey-reflect[orjson]
+except ImportError:
+    orjson = None
+
 from sparkey_reflect.core.models import (
     ConversationTurn,
     RuleFileInfo,
     Session,
     SessionType,
+    ToolCall,
     ToolType,
 )
 from sparkey_reflect.readers.base_reader import BaseReader
@@ -35,25 +42,74 @@ logger = logging.getLogger(__name__)
 CLAUDE_DIR = Path.home() / ".claude"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
 
-# Patterns for classifying session type from conversation content
+# Patterns for classifying session type from conversation content,
+# compiled once at import
 SESSION_TYPE_PATTERNS = {
     SessionType.DEBUGGING: [
-        r"\b(debug|error|traceback|exception|fix|bug|issue|broken|crash|fail)\b",
+        re.compile(
+            r"\b(debug|error|traceback|exception|fix|bug|issue|broken|crash|fail)\b",
+            re.IGNORECASE,
+        ),
     ],
     SessionType.TESTING: [
-        r"\b(test|spec|assert|mock|fixture|coverage|pytest|jest|unittest)\b",
+        re.compile(
+            r"\b(test|spec|assert|mock|fixture|coverage|pytest|jest|unittest)\b",
+            re.IGNORECASE,
+        ),
     ],
     SessionType.REFACTORING: [
-        r"\b(refactor|rename|extract|restructure|reorganize|clean.?up|simplif)\b",
+        re.compile(
+            r"\b(refactor|rename|extract|restructure|reorganize|clean.?up|simplif)\b",
+            re.IGNORECASE,
+        ),
     ],
     SessionType.DOCS: [
-        r"\b(document|readme|docstring|comment|explain|description|api.?doc)\b",
+        re.compile(
+            r"\b(document|readme|docstring|comment|explain|description|api.?doc)\b",
+            re.IGNORECASE,
+        ),
     ],
     SessionType.EXPLORATION: [
-        r"\b(explore|search|find|where|how does|what is|understand|investigate)\b",
+        re.compile(
+            r"\b(explore|search|find|where|how does|what is|understand|investigate)\b",
+            re.IGNORECASE,
+        ),
     ],
 }
 
+# All session-type patterns fused into one alternation, one named group per
+# type, so classification is a single scan of each turn
+SESSION_TYPE_RE = re.compile(
+    "|".join(
+        f"(?P<{stype.name}>{'|'.join(p.pattern for p in patterns)})"
+        for stype, patterns in SESSION_TYPE_PATTERNS.items()
+    ),
+    re.IGNORECASE,
+)
+
+# Turn content hinting at an error, and file-like references in it
+ERROR_CONTEXT_RE = re.compile(r"(error|exception|traceback|stack trace|failed|errno)", re.IGNORECASE)
+FILE_REF_RE = re.compile(r'[\w./\\-]+\.\w{1,10}')
+
+# Read buffer for session files; entries with pasted files or tool output run
+# to hundreds of KB, and the default 8 KB buffer splits each across many reads
+JSONL_READ_BUFFER = 1 << 20
+
+
+def _loads(line: bytes) -> Any:
+    """Decode one JSONL entry: orjson when installed, else the stdlib.
+
+    orjson rejects lone surrogate escapes (written by JSON.stringify when it
+    cuts text mid-emoji) that the stdlib accepts, so those lines are retried
+    with json.loads rather than dropped.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
 
 class ClaudeCodeReader(BaseReader):
     """Reader for Claude Code conversation data."""
@@ -177,14 +233,17 @@ class ClaudeCodeReader(BaseReader):
         session_id = None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            # Binary lines go straight to the decoder (orjson takes bytes)
+            with open(file_path, "rb", buffering=JSONL_READ_BUFFER) as f:
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
                     try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
+                        entry = _loads(line)
+                    except ValueError:  # includes both decoders' JSONDecodeError
+                        continue
+                    if not isinstance(entry, dict):
                         continue
 
                     entry_type = entry.get("type", "")
@@ -298,10 +357,10 @@ class ClaudeCodeReader(BaseReader):
                 if block_type == "text":
                     text_parts.append(block.get("text", ""))
                 elif block_type == "tool_use":
-                    tool_calls.append({
-                        "name": block.get("name", ""),
-                        "id": block.get("id", ""),
-                    })
+                    tool_calls.append(ToolCall(
+                        name=block.get("name", ""),
+                        id=block.get("id", ""),
+                    ))
                 elif block_type == "tool_result":
                     tool_name = block.get("tool_use_id", "")
                     sub_content = block.get("content", "")
@@ -315,8 +374,7 @@ class ClaudeCodeReader(BaseReader):
 
         # Detect error context
         if content:
-            error_patterns = r"(error|exception|traceback|stack trace|failed|errno)"
-            if re.search(error_patterns, content, re.IGNORECASE):
+            if ERROR_CONTEXT_RE.search(content):
                 has_error = True
 
             # Detect code snippets
@@ -324,8 +382,7 @@ class ClaudeCodeReader(BaseReader):
                 has_code = True
 
             # Extract file references
-            file_pattern = r'[\w./\\-]+\.\w{1,10}'
-            file_refs = list(set(re.findall(file_pattern, content)))[:20]
+            file_refs = list(set(FILE_REF_RE.findall(content)))[:20]
 
         # Parse timestamp from JSONL entry (not from message)
         timestamp = None
@@ -409,21 +466,21 @@ class ClaudeCodeReader(BaseReader):
 
     def _classify_session(self, turns: List[ConversationTurn]) -> SessionType:
         """Classify session type based on user message content."""
-        user_text = " ".join(
-            t.content for t in turns if t.role == "user" and t.content
-        ).lower()
-
-        if not user_text:
+        # Scan each user turn in place instead of joining them into one blob
+        counts: Counter = Counter()
+        has_user_text = False
+        for t in turns:
+            if t.role == "user" and t.content:
+                has_user_text = True
+                counts.update(m.lastgroup for m in SESSION_TYPE_RE.finditer(t.content))
+
+        if not has_user_text:
             return SessionType.UNKNOWN
 
-        scores: Dict[SessionType, int] = {}
-        for stype, patterns in SESSION_TYPE_PATTERNS.items():
-            count = 0
-            for pat in patterns:
-                count += len(re.findall(pat, user_text, re.IGNORECASE))
-            if count > 0:
-                scores[stype] = count
-
+        # Ties go to the type listed first in SESSION_TYPE_PATTERNS
+        scores: Dict[SessionType, int] = {
+            stype: counts[stype.name] for stype in SESSION_TYPE_PATTERNS if counts[stype.name]
+        }
         if scores:
             return max(scores, key=scores.get)
 
@@ -451,7 +508,7 @@ class ClaudeCodeReader(BaseReader):
         ]
         for rel_path, file_type in project_files:
             full_path = workspace / rel_path
-            rule_files.append(self._read_rule_file(full_path, file_type))
+            rule_files.append(self._load_rule_file(full_path, file_type))
 
         # Nested CLAUDE.md files (search one level deep)
         try:
@@ -460,7 +517,7 @@ class ClaudeCodeReader(BaseReader):
                     nested = subdir / "CLAUDE.md"
                     if nested.exists():
                         rule_files.append(
-                            self._read_rule_file(nested, "claude_md_nested")
+                            self._load_rule_file(nested, "claude_md_nested")
                         )
         except OSError:
             pass
@@ -471,7 +528,7 @@ class ClaudeCodeReader(BaseReader):
             (Path.home() / ".claude.json", "claude_user_mcp"),
         ]
         for path, file_type in user_files:
-            rule_files.append(self._read_rule_file(path, file_type))
+            rule_files.append(self._load_rule_file(path, file_type))
 
         # Memory files
         if PROJECTS_DIR.exists():
@@ -483,7 +540,7 @@ class ClaudeCodeReader(BaseReader):
                     memory_md = memory_dir / "MEMORY.md"
                     if memory_md.exists():
                         rule_files.append(
-                            self._read_rule_file(memory_md, "claude_memory")
+                            self._load_rule_file(memory_md, "claude_memory")
                         )
 
         return rule_files
@@ -33,6 +33,7 @@ from sparkey_reflect.core.models import (
     RuleFileInfo,
     Session,
     SessionType,
+    ToolCall,
     ToolType,
 )
 from sparkey_reflect.readers.base_reader import BaseReader
@@ -277,10 +278,10 @@ class CopilotReader(BaseReader):
             tool_calls = []
             for tc in raw.get("toolCalls", raw.get("tool_calls", [])):
                 if isinstance(tc, dict):
-                    tool_calls.append({
-                        "name": tc.get("name") or tc.get("function", {}).get("name", ""),
-                        "id": tc.get("id", ""),
-                    })
+                    tool_calls.append(ToolCall(
+                        name=tc.get("name") or tc.get("function", {}).get("name", ""),
+                        id=tc.get("id", ""),
+                    ))
 
             timestamp = self._parse_timestamp(
                 raw.get("timestamp") or raw.get("createdAt")
@@ -683,23 +684,23 @@ class CopilotReader(BaseReader):
         ]
         for rel_path, file_type in project_files:
             full_path = workspace / rel_path
-            rule_files.append(self._read_rule_file(full_path, file_type))
+            rule_files.append(self._load_rule_file(full_path, file_type))
 
         # Path-scoped instruction files
         instructions_dir = workspace / ".github" / "instructions"
         if instructions_dir.exists():
             for inst_file in sorted(instructions_dir.glob("*.instructions.md")):
-                rule_files.append(self._read_rule_file(inst_file, "copilot_scoped_instructions"))
+                rule_files.append(self._load_rule_file(inst_file, "copilot_scoped_instructions"))
 
         # Prompt files / slash commands
         prompts_dir = workspace / ".github" / "prompts"
         if prompts_dir.exists():
             for prompt_file in sorted(prompts_dir.glob("*.md")):
-                rule_files.append(self._read_rule_file(prompt_file, "copilot_prompt"))
+                rule_files.append(self._load_rule_file(prompt_file, "copilot_prompt"))
 
         # Copilot skills
         skills_file = workspace / ".github" / "copilot-skills.md"
-        rule_files.append(self._read_rule_file(skills_file, "copilot_skills"))
+        rule_files.append(self._load_rule_file(skills_file, "copilot_skills"))
 
         # Nested AGENTS.md (one level deep)
         try:
@@ -708,7 +709,7 @@ class CopilotReader(BaseReader):
                     agents_md = subdir / "AGENTS.md"
                     if agents_md.exists():
                         rule_files.append(
-                            self._read_rule_file(agents_md, "agents_md_nested")
+                            self._load_rule_file(agents_md, "agents_md_nested")
                         )
         except OSError:
             pass
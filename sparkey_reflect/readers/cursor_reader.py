@@ -25,6 +25,7 @@ from sparkey_reflect.core.models import (
     RuleFileInfo,
     Session,
     SessionType,
+    ToolCall,
     ToolType,
 )
 from sparkey_reflect.readers.base_reader import BaseReader
@@ -526,10 +527,10 @@ class CursorReader(BaseReader):
         if raw.get("tool_calls"):
             for tc in raw["tool_calls"]:
                 if isinstance(tc, dict):
-                    tool_calls.append({
-                        "name": tc.get("name") or tc.get("function", {}).get("name", ""),
-                        "id": tc.get("id", ""),
-                    })
+                    tool_calls.append(ToolCall(
+                        name=tc.get("name") or tc.get("function", {}).get("name", ""),
+                        id=tc.get("id", ""),
+                    ))
 
         timestamp = self._extract_timestamp(raw)
         input_tokens = self._extract_token_count(raw, "input")
@@ -672,27 +673,27 @@ class CursorReader(BaseReader):
         ]
         for rel_path, file_type in project_files:
             full_path = workspace / rel_path
-            rule_files.append(self._read_rule_file(full_path, file_type))
+            rule_files.append(self._load_rule_file(full_path, file_type))
 
         # Modern .cursor/rules/*.mdc files
         rules_dir = workspace / ".cursor" / "rules"
         if rules_dir.exists():
             for mdc_file in sorted(rules_dir.glob("*.mdc")):
-                rule_files.append(self._read_rule_file(mdc_file, "cursor_mdc"))
+                rule_files.append(self._load_rule_file(mdc_file, "cursor_mdc"))
 
         # Custom slash commands
         commands_dir = workspace / ".cursor" / "commands"
         if commands_dir.exists():
             for cmd_file in sorted(commands_dir.glob("*.md")):
-                rule_files.append(self._read_rule_file(cmd_file, "cursor_command"))
+                rule_files.append(self._load_rule_file(cmd_file, "cursor_command"))
 
         # User-level MCP config
         user_mcp = Path.home() / ".cursor" / "mcp.json"
-        rule_files.append(self._read_rule_file(user_mcp, "cursor_user_mcp"))
+        rule_files.append(self._load_rule_file(user_mcp, "cursor_user_mcp"))
 
         # User-level hooks
         user_hooks = Path.home() / ".cursor" / "hooks.json"
-        rule_files.append(self._read_rule_file(user_hooks, "cursor_user_hooks"))
+        rule_files.append(self._load_rule_file(user_hooks, "cursor_user_hooks"))
 
         return rule_files
 
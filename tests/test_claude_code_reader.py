@@ -0,0 +1,96 @@
+"""Tests for the Claude Code JSONL reader."""
+
+import json
+
+import pytest
+
+import sparkey_reflect.readers.base_reader as base_reader
+import sparkey_reflect.readers.claude_code_reader as claude_code_reader
+from sparkey_reflect.readers.claude_code_reader import ClaudeCodeReader
+
+
+def _entry(role, content, minute):
+    return json.dumps({
+        "type": role,
+        "sessionId": "abc",
+        "cwd": "/home/dev/project",
+        "timestamp": f"2026-01-01T00:{minute:02d}:00Z",
+        "message": {"role": role, "content": content},
+    })
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def decoder(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib decoder."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(claude_code_reader, "orjson", None)
+    return request.param
+
+
+class TestParseJsonlSession:
+    def test_lone_surrogate_line_kept(self, tmp_path, decoder):
+        # JSON.stringify leaves a lone surrogate escape when it cuts an emoji in half
+        truncated = _entry("user", "Fix the bug ", 0).replace('bug "', 'bug \\ud83d"')
+        path = tmp_path / "session.jsonl"
+        path.write_text("\n".join([
+            truncated,
+            "{broken",
+            _entry("assistant", "On it.", 1),
+        ]) + "\n")
+        session = ClaudeCodeReader()._parse_jsonl_session(path)
+        assert [t.role for t in session.turns] == ["user", "assistant"]
+        assert session.turns[0].content == "Fix the bug \ud83d"
+        assert session.session_id == "cc_abc"
+
+
+class TestHistoryRange:
+    @pytest.fixture
+    def reader(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(claude_code_reader, "PROJECTS_DIR", tmp_path)
+        (tmp_path / "proj").mkdir()
+        (tmp_path / "proj" / "a.jsonl").write_text(_entry("user", "hi", 0) + "\n")
+        reader = ClaudeCodeReader()
+        reader.scans = []
+        scan = reader.get_history_range
+
+        def counted_scan():
+            reader.scans.append(1)
+            return scan()
+
+        monkeypatch.setattr(reader, "get_history_range", counted_scan)
+        return reader
+
+    def test_repeated_status_reuses_scan(self, reader):
+        first = reader.get_status()
+        assert reader.get_status() == first
+        assert first["latest_data"] is not None
+        assert len(reader.scans) == 1
+
+    def test_new_session_file_rescans(self, reader, tmp_path):
+        reader.get_status()
+        (tmp_path / "proj" / "b.jsonl").write_text(_entry("user", "hi", 1) + "\n")
+        reader.get_status()
+        assert len(reader.scans) == 2
+
+    def test_expired_or_invalidated_range_rescans(self, reader, monkeypatch):
+        reader.get_status()
+        reader.invalidate()
+        reader.get_status()
+        monkeypatch.setattr(base_reader, "HISTORY_CACHE_TTL_SECONDS", 0)
+        reader.get_status()
+        assert len(reader.scans) == 3
+
+
+class TestRuleFileCache:
+    def test_cached_copy_does_not_share_sections(self, tmp_path):
+        path = tmp_path / "CLAUDE.md"
+        path.write_text("# Project\n\nContext.\n\n## Style\n\nUse black.\n")
+        reader = ClaudeCodeReader()
+        first = reader._load_rule_file(path, "claude_md")
+        assert first.sections
+        first.sections.append("Injected")
+        second = reader._load_rule_file(path, "claude_md")
+        assert "Injected" not in second.sections
+        assert second.sections is not first.sections
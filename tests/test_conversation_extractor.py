@@ -2,8 +2,20 @@
 
 import pytest
 
-from sparkey_reflect.core.models import ConversationTurn, Session, SessionType, ToolType
-from sparkey_reflect.insights.conversation_extractor import ConversationExtractor
+from sparkey_reflect.core.models import (
+    ConversationTurn,
+    Session,
+    SessionType,
+    ToolCall,
+    ToolType,
+)
+from sparkey_reflect.insights.conversation_extractor import (
+    REFLECT_MARKER_SENTINEL,
+    REFLECT_SESSION_MARKERS,
+    ConversationExtractor,
+    ExtractedSession,
+    ExtractedTurn,
+)
 
 
 @pytest.fixture
@@ -34,6 +46,9 @@ class TestConversationExtractor:
         # Reflect session should be excluded (no turns)
         assert len(extracted) == 0
 
+    def test_every_marker_contains_sentinel(self):
+        assert all(REFLECT_MARKER_SENTINEL in m for m in REFLECT_SESSION_MARKERS)
+
     def test_excludes_reflect_cli_sessions(self, extractor, make_session, make_turn):
         session = make_session(turns=[
             make_turn(content="Run sparkey_reflect analyze --days 7"),
@@ -56,7 +71,7 @@ class TestConversationExtractor:
             make_turn(
                 role="assistant",
                 content="",
-                tool_calls=[{"name": "Read"}, {"name": "Edit"}],
+                tool_calls=[ToolCall("Read"), ToolCall("Edit")],
             ),
         ])
         extracted = extractor.extract([session])
@@ -141,6 +156,14 @@ class TestTokenEstimation:
         tokens = extractor.estimate_tokens(extracted)
         assert tokens > 0
 
+    def test_counts_ids_content_and_tool_calls(self, extractor):
+        extracted = [ExtractedSession(
+            session_id="s" * 8,
+            workspace="w" * 8,
+            turns=[ExtractedTurn(role="assistant", content="c" * 16, tool_calls=["Read", "Edit"])],
+        )]
+        assert extractor.estimate_tokens(extracted) == (8 + 8 + 16 + 8) // 4
+
 
 class TestPromptFormatting:
     def test_to_prompt_text(self, extractor, make_session, make_turn):
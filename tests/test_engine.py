@@ -0,0 +1,69 @@
+"""Tests for the Reflect engine orchestration."""
+
+import threading
+
+import pytest
+
+import sparkey_reflect.core.engine as engine_mod
+from sparkey_reflect.analyzers.registry import ReflectAnalyzerConfig
+from sparkey_reflect.core.engine import ReflectEngine
+from sparkey_reflect.core.models import ReflectReport, ToolType
+from sparkey_reflect.core.storage import ReflectStorage
+
+
+@pytest.fixture
+def engine(tmp_path):
+    e = ReflectEngine(storage=ReflectStorage(db_path=tmp_path / "test.db"), use_llm=False)
+    yield e
+    e.storage.close()
+
+
+class TestRunAnalyzers:
+    @pytest.mark.parametrize("enabled", [
+        ["prompt_quality", "tool_usage", "session_patterns"],
+        ["prompt_quality"],
+    ])
+    def test_failing_constructor_skips_only_that_analyzer(self, engine, sample_sessions, monkeypatch, enabled):
+        get_analyzer = engine._get_analyzer
+
+        def flaky(key):
+            if key == "prompt_quality":
+                raise RuntimeError("boom")
+            return get_analyzer(key)
+
+        monkeypatch.setattr(engine, "_get_analyzer", flaky)
+        results = engine._run_analyzers(sample_sessions, [], ReflectAnalyzerConfig(enabled=enabled))
+        assert {r.analyzer_key for r in results} == set(enabled[1:])
+
+
+class TestBackgroundPersist:
+    def test_close_drains_queue_and_stops_writer(self, tmp_path, make_result, now, monkeypatch):
+        registered = []
+        monkeypatch.setattr(engine_mod.atexit, "register", registered.append)
+        monkeypatch.setattr(engine_mod.atexit, "unregister", registered.remove)
+        storage = ReflectStorage(db_path=tmp_path / "test.db")
+        closed_in = []
+        close = storage.close
+
+        def recording_close():
+            closed_in.append(threading.current_thread().name)
+            close()
+
+        monkeypatch.setattr(storage, "close", recording_close)
+        e = ReflectEngine(storage=storage, use_llm=False, background_persist=True)
+        assert registered == [e.flush]
+        writer = e._persist_thread
+
+        report = ReflectReport(
+            tool=ToolType.CLAUDE_CODE, period_start=now, period_end=now,
+            overall_score=70.0, results=[make_result()],
+        )
+        e._persist_queue.put((report, ToolType.CLAUDE_CODE))
+        e.close()
+        e.close()
+
+        assert not writer.is_alive()
+        assert closed_in == ["reflect-persist"]
+        assert registered == []
+        assert storage.get_latest_report("claude_code") is not None
+        storage.close()
@@ -7,6 +7,9 @@ import pytest
 
 from sparkey_reflect.core.models import (
     AnalysisResult,
+    InsightCategory,
+    InsightSeverity,
+    ReflectInsight,
     ToolType,
     TrendDirection,
 )
@@ -159,6 +162,64 @@ class TestGenerateReport:
         assert len(report.insights) == 0
         assert report.overall_assessment is None
 
+    def test_trends_use_one_history_query(self, make_result, now):
+        storage = MagicMock()
+        storage.get_score_histories.return_value = {
+            "prompt_quality": [{"score": 50.0}, {"score": 52.0}, {"score": 55.0}],
+        }
+        gen = InsightGenerator(storage=storage, use_llm=False)
+        report = gen.generate_report(
+            results=[
+                make_result(key="prompt_quality", score=70.0),
+                make_result(key="tool_usage", score=60.0),
+            ],
+            tool=ToolType.CLAUDE_CODE,
+            period_start=now,
+            period_end=now,
+        )
+        storage.get_score_histories.assert_called_once()
+        storage.get_score_history.assert_not_called()
+        assert report.trends == {
+            "prompt_quality": TrendDirection.IMPROVING,
+            "tool_usage": TrendDirection.INSUFFICIENT_DATA,
+        }
+
+    def test_insights_ordered_by_severity(self, make_result, make_session, now):
+        gen = InsightGenerator(storage=None, use_llm=True)
+        gen._llm_generator = MagicMock()
+        gen._llm_generator.generate_insights.return_value = {}
+        gen._llm_generator.parse_insights.return_value = [
+            ReflectInsight(category=InsightCategory.TOOL_MASTERY, title=title,
+                           severity=severity, recommendation="", evidence="")
+            for title, severity in [
+                ("a", InsightSeverity.INFO),
+                ("b", InsightSeverity.CRITICAL),
+                ("c", InsightSeverity.SUGGESTION),
+                ("d", InsightSeverity.CRITICAL),
+                ("e", InsightSeverity.WARNING),
+            ]
+        ]
+        report = gen.generate_report(
+            results=[make_result()],
+            tool=ToolType.CLAUDE_CODE,
+            period_start=now,
+            period_end=now,
+            sessions=[make_session()],
+        )
+        assert [i.title for i in report.insights] == ["b", "d", "e", "c", "a"]
+        assert {i.created_at for i in report.insights} == {report.created_at}
+
+    def test_llm_generator_built_only_when_sessions_given(self, make_result, now):
+        gen = InsightGenerator(storage=None, use_llm=True)
+        gen.generate_report(
+            results=[make_result()],
+            tool=ToolType.CLAUDE_CODE,
+            period_start=now,
+            period_end=now,
+        )
+        assert gen._llm_generator is None
+        assert gen.llm_generator is gen.llm_generator
+
 
 class TestFormatDigest:
     def test_weekly_digest_contains_sections(self, generator, make_result, now):
@@ -0,0 +1,193 @@
+"""Tests for the LLM Insight Generator."""
+
+import json
+import os
+import re
+import time
+from datetime import timedelta
+
+import pytest
+
+from sparkey_reflect.core.models import AnalysisResult, InsightCategory, InsightSeverity
+from sparkey_reflect.insights.llm_generator import (
+    MIN_PROMPT_SESSIONS,
+    LLMInsightGenerator,
+    _unwrap_cli_output,
+)
+
+RESPONSE = json.dumps({"overall_assessment": "Solid week.", "insights": []})
+
+
+@pytest.fixture
+def results():
+    return [AnalysisResult(analyzer_key="prompt_quality", analyzer_name="Prompt Quality", score=70.0)]
+
+
+@pytest.fixture
+def cli_calls(monkeypatch):
+    """Replace the CLI call with a stub that records each invocation."""
+    calls = []
+
+    def fake_call(self, system_prompt, user_prompt):
+        calls.append(user_prompt)
+        return RESPONSE
+
+    monkeypatch.setattr(LLMInsightGenerator, "_call_via_cli", fake_call)
+    return calls
+
+
+class TestResponseCache:
+    def test_repeat_prompt_served_from_cache(self, tmp_path, results, cli_calls, make_session):
+        gen = LLMInsightGenerator(cache_dir=tmp_path)
+        sessions = [make_session()]
+        first = gen.generate_insights(results, sessions)
+        second = LLMInsightGenerator(cache_dir=tmp_path).generate_insights(results, sessions)
+        assert first == second == json.loads(RESPONSE)
+        assert len(cli_calls) == 1
+
+    def test_changed_prompt_misses(self, tmp_path, results, cli_calls, make_session):
+        gen = LLMInsightGenerator(cache_dir=tmp_path)
+        gen.generate_insights(results, [make_session()])
+        results[0].score = 40.0
+        gen.generate_insights(results, [make_session()])
+        assert len(cli_calls) == 2
+
+    def test_expired_entry_ignored(self, tmp_path, results, cli_calls, make_session):
+        gen = LLMInsightGenerator(cache_dir=tmp_path, cache_ttl_seconds=0)
+        gen.generate_insights(results, [make_session()])
+        gen.generate_insights(results, [make_session()])
+        assert len(cli_calls) == 2
+
+    def test_env_disables_cache(self, tmp_path, results, cli_calls, make_session, monkeypatch):
+        monkeypatch.setenv("REFLECT_NO_CACHE", "1")
+        gen = LLMInsightGenerator(cache_dir=tmp_path)
+        gen.generate_insights(results, [make_session()])
+        gen.generate_insights(results, [make_session()])
+        assert len(cli_calls) == 2
+        assert list(tmp_path.iterdir()) == []
+
+
+    def test_use_cache_false_disables_cache(self, tmp_path, results, cli_calls, make_session):
+        gen = LLMInsightGenerator(cache_dir=tmp_path, use_cache=False)
+        gen.generate_insights(results, [make_session()])
+        gen.generate_insights(results, [make_session()])
+        assert gen.cache_dir is None
+        assert len(cli_calls) == 2
+        assert list(tmp_path.iterdir()) == []
+
+class TestPromptConstruction:
+    def test_nested_metrics_serialized_compactly(self, results, make_session):
+        results[0].metrics = {"specificity": 18.0, "task_type_distribution": {"bugfix": 2, "café": 1}}
+        prompt = LLMInsightGenerator(use_cache=False)._build_user_prompt(
+            results, [make_session()], None, None
+        )
+        assert "Metrics: specificity=18.0" in prompt
+        assert 'task_type_distribution: {"bugfix":2,"café":1}' in prompt
+
+    def test_budget_keeps_newest_sessions_in_order(self, results, make_session, make_turn, now):
+        sessions = [
+            make_session(
+                session_id=f"session-{i:02d}",
+                start_time=now + timedelta(hours=i),
+                turns=[make_turn(content="Refactor the parser " * 50)],
+            )
+            for i in range(12)
+        ]
+        gen = LLMInsightGenerator(use_cache=False, context_window_limit=2000)
+        prompt = gen._build_user_prompt(results, sessions, None, None)
+        kept = re.findall(r"### Session: (session-\d+)", prompt)
+        assert len(kept) < len(sessions)
+        assert kept == [f"session-{i:02d}" for i in range(12 - len(kept), 12)]
+        assert len(prompt) <= 2000 * 4
+
+    def test_newest_sessions_kept_past_budget(self, results, make_session, make_turn, now):
+        sessions = [
+            make_session(session_id=f"session-{i:02d}", start_time=now + timedelta(hours=i))
+            for i in range(8)
+        ]
+        gen = LLMInsightGenerator(use_cache=False, context_window_limit=1)
+        prompt = gen._build_user_prompt(results, sessions, None, None)
+        assert len(re.findall(r"### Session:", prompt)) == MIN_PROMPT_SESSIONS
+
+    def test_untimestamped_sessions_keep_input_order(self, results, make_session, make_turn):
+        sessions = [make_session(session_id=f"sess-{i}", turns=[make_turn()]) for i in range(3)]
+        for s in sessions:
+            s.start_time = None
+        prompt = LLMInsightGenerator(use_cache=False)._build_user_prompt(results, sessions, None, None)
+        assert re.findall(r"### Session: (sess-\d)", prompt) == ["sess-0", "sess-1", "sess-2"]
+
+    def test_sessions_that_fit_keep_input_order(self, results, make_session, make_turn, now):
+        sessions = [
+            make_session(session_id=f"sess-{i}", start_time=now - timedelta(hours=i))
+            for i in range(3)
+        ]
+        prompt = LLMInsightGenerator(use_cache=False)._build_user_prompt(results, sessions, None, None)
+        assert re.findall(r"### Session: (sess-\d)", prompt) == ["sess-0", "sess-1", "sess-2"]
+
+
+class TestParseResponse:
+    def test_fenced_json(self):
+        data = LLMInsightGenerator(use_cache=False)._parse_response("```json\n" + RESPONSE + "\n```")
+        assert data == json.loads(RESPONSE)
+
+    def test_malformed_json_wrapped(self):
+        data = LLMInsightGenerator(use_cache=False)._parse_response("{not json")
+        assert len(data["insights"]) == 1
+
+    def test_bare_json_with_trailing_text(self):
+        data = LLMInsightGenerator(use_cache=False)._parse_response(RESPONSE + "\n\nLet me know!")
+        assert data == json.loads(RESPONSE)
+
+
+class TestCliEnvelope:
+    def test_result_text_unwrapped(self):
+        envelope = json.dumps({"type": "result", "is_error": False, "result": "```json\n" + RESPONSE + "\n```"})
+        assert _unwrap_cli_output(envelope) == "```json\n" + RESPONSE + "\n```"
+
+    def test_bare_reply_passed_through(self):
+        assert _unwrap_cli_output(RESPONSE) == RESPONSE
+        assert _unwrap_cli_output("plain text") == "plain text"
+
+    def test_error_envelope_yields_none(self):
+        assert _unwrap_cli_output(json.dumps({"is_error": True, "result": "Credit balance too low"})) is None
+
+
+class TestParseInsights:
+    def test_labels_normalized(self):
+        insights = LLMInsightGenerator(use_cache=False).parse_insights({"insights": [
+            {"category": " Tool_Mastery", "severity": "CRITICAL", "title": "t"},
+            {"category": None, "severity": "bogus"},
+        ]})
+        assert insights[0].category == InsightCategory.TOOL_MASTERY
+        assert insights[0].severity == InsightSeverity.CRITICAL
+        assert insights[1].category == InsightCategory.PROMPT_ENGINEERING
+        assert insights[1].severity == InsightSeverity.SUGGESTION
+
+
+class TestResponseCacheHygiene:
+    def test_garbled_reply_not_cached(self, tmp_path, results, make_session, monkeypatch):
+        calls = []
+
+        def garbled(self, system_prompt, user_prompt):
+            calls.append(user_prompt)
+            return "Sorry, I can't help with that."
+
+        monkeypatch.setattr(LLMInsightGenerator, "_call_via_cli", garbled)
+        gen = LLMInsightGenerator(cache_dir=tmp_path)
+        data = gen.generate_insights(results, [make_session()])
+        assert data["overall_assessment"] == "Analysis completed (raw output)."
+        gen.generate_insights(results, [make_session()])
+        assert len(calls) == 2
+        assert list(tmp_path.iterdir()) == []
+
+    def test_expired_entries_pruned_on_write(self, tmp_path, results, cli_calls, make_session):
+        stale = tmp_path / "stale.json"
+        stale.write_text("{}")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+        LLMInsightGenerator(cache_dir=tmp_path, cache_ttl_seconds=60).generate_insights(
+            results, [make_session()]
+        )
+        remaining = list(tmp_path.iterdir())
+        assert stale not in remaining
+        assert len(remaining) == 1
@@ -11,6 +11,7 @@ from sparkey_reflect.core.models import (
     ReflectReport,
     Session,
     SessionType,
+    ToolCall,
     ToolType,
     TrendDirection,
 )
@@ -64,14 +65,34 @@ class TestSession:
     def test_tool_use_count(self, make_session, make_turn):
         session = make_session(turns=[
             make_turn(role="assistant", content="running", tool_calls=[
-                {"name": "Read"}, {"name": "Edit"},
+                ToolCall("Read"), ToolCall("Edit"),
             ]),
             make_turn(role="assistant", content="done", tool_calls=[
-                {"name": "Bash"},
+                ToolCall("Bash"),
             ]),
         ])
         assert session.tool_use_count == 3
 
+    def test_turn_subsets(self, make_session, make_turn):
+        session = make_session(turns=[
+            make_turn(content="Fix the login bug"),
+            make_turn(content=""),
+            make_turn(role="assistant", content="Looking"),
+            make_turn(role="assistant", content="", tool_calls=[ToolCall("Read")]),
+        ])
+        assert [t.content for t in session.user_turns] == ["Fix the login bug"]
+        assert len(session.actionable_turns) == 2
+
+    def test_derived_counts_follow_turn_changes(self, make_session, make_turn):
+        session = make_session(turns=[make_turn(content="Fix it")])
+        assert session.user_turn_count == len(session.user_turns) == 1
+        session.turns.append(make_turn(content="And the tests"))
+        assert session.user_turn_count == len(session.user_turns) == 2
+        session.turns = [make_turn(role="assistant", content="Done")]
+        assert session.user_turn_count == 0
+        assert session.assistant_turn_count == 1
+        assert session.actionable_turns == []
+
     def test_empty_session_properties(self):
         session = Session(session_id="empty", tool=ToolType.CLAUDE_CODE)
         assert session.total_tokens == 0
@@ -44,6 +44,9 @@ class TestSigmoid:
         assert sigmoid(-1000, 0, 100) == pytest.approx(0.0, abs=1e-10)
         assert sigmoid(1000, 0, 100) == pytest.approx(1.0, abs=1e-10)
 
+    def test_nan_input_clamps_like_the_low_tail(self):
+        assert sigmoid(math.nan, 5, 1.0) == 1.0 / (1.0 + math.exp(500))
+
     def test_output_range_zero_to_one(self):
         for x in [-10, -1, 0, 0.5, 1, 5, 10, 100]:
             result = sigmoid(x, 3, 2)
@@ -1,5 +1,6 @@
 """Tests for SQLite storage layer using in-memory database."""
 
+import json
 from datetime import datetime, timezone, timedelta
 
 import pytest
@@ -38,6 +39,12 @@ class TestStorageSchema:
         assert "config" in tables
 
 
+    def test_connection_pragmas(self, storage):
+        assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert storage.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert storage.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
 class TestConfig:
     def test_set_and_get(self, storage):
         storage.set_config("test_key", "test_value")
@@ -52,6 +59,34 @@ class TestConfig:
         storage.set_config("key", "v2")
         assert storage.get_config("key") == "v2"
 
+    def test_get_configs(self, storage):
+        storage.set_config("a", "1")
+        storage.set_config("b", "2")
+        assert storage.get_configs(["a", "b", "missing"]) == {"a": "1", "b": "2"}
+        assert storage.get_configs([]) == {}
+
+
+class TestSessionMetadata:
+    def test_save_batch_and_count(self, storage, make_session, make_turn):
+        sessions = [
+            make_session(session_id=f"s{i}", turns=[make_turn(content="Fix the bug")])
+            for i in range(3)
+        ]
+        storage.save_sessions_metadata(sessions)
+        storage.save_session_metadata(sessions[0])  # replaces, not duplicates
+        assert storage.get_session_count(tool="claude_code") == 3
+
+    def test_resave_updates_in_place(self, storage, make_session, make_turn):
+        session = make_session(session_id="s1", turns=[make_turn(content="Fix it")])
+        first_id = storage.save_session_metadata(session)
+        storage.save_session_metadata(make_session(session_id="s2"))
+        session.turns.append(make_turn(content="And the tests"))
+        assert storage.save_session_metadata(session) == first_id
+        row = storage.conn.execute(
+            "SELECT turn_count, user_turn_count FROM session_metadata WHERE session_id = 's1'"
+        ).fetchone()
+        assert tuple(row) == (2, 2)
+
 
 class TestAnalysisResults:
     def test_save_and_retrieve(self, storage):
@@ -70,6 +105,24 @@ class TestAnalysisResults:
         assert scores[0]["analyzer_key"] == "prompt_quality"
         assert scores[0]["score"] == 72.5
 
+    @pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+    def test_non_finite_metrics_stored_as_null(self, storage, monkeypatch, backend):
+        from sparkey_reflect.core import storage as storage_mod
+        if backend == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(storage_mod, "orjson", None)
+        result = AnalysisResult(
+            analyzer_key="prompt_quality",
+            analyzer_name="Prompt Quality",
+            score=50.0,
+            metrics={"ratio": float("nan"), "peak": float("inf"), "note": "\ud83d"},
+        )
+        storage.save_analysis_result(result, "claude_code")
+
+        metrics = json.loads(storage.get_latest_scores("claude_code")[0]["metrics"])
+        assert metrics == {"ratio": None, "peak": None, "note": "\ud83d"}
+
     def test_score_history(self, storage):
         for i in range(5):
             result = AnalysisResult(
@@ -82,6 +135,106 @@ class TestAnalysisResults:
 
         history = storage.get_score_history("prompt_quality", "claude_code", days=30)
         assert len(history) == 5
+        raw = storage.get_score_history("prompt_quality", "claude_code", days=30, raw=True)
+        assert [row[0] for row in raw] == [h["score"] for h in history]
+
+    def test_score_history_includes_cutoff_day(self, storage):
+        result = AnalysisResult(
+            analyzer_key="prompt_quality", analyzer_name="Prompt Quality", score=60.0
+        )
+        row_id = storage.save_analysis_result(result, "claude_code")
+        storage.conn.execute(
+            "UPDATE analysis_results SET created_at = datetime('now', '-30 days', '+1 hour')"
+            " WHERE id = ?",
+            (row_id,),
+        )
+        assert len(storage.get_score_history("prompt_quality", "claude_code", days=30)) == 1
+        assert storage.get_score_history("prompt_quality", "claude_code", days=29) == []
+
+    def test_score_histories_bulk(self, storage):
+        for key, score in [("prompt_quality", 50.0), ("tool_usage", 60.0), ("prompt_quality", 55.0)]:
+            storage.save_analysis_result(
+                AnalysisResult(analyzer_key=key, analyzer_name=key, score=score), "claude_code"
+            )
+        histories = storage.get_score_histories(
+            ["prompt_quality", "tool_usage", "rule_file"], "claude_code", days=30
+        )
+        assert set(histories) == {"prompt_quality", "tool_usage"}
+        assert histories["prompt_quality"] == storage.get_score_history(
+            "prompt_quality", "claude_code", days=30
+        )
+        assert storage.get_score_histories([], "claude_code") == {}
+
+    def test_save_bulk(self, storage):
+        results = [
+            AnalysisResult(analyzer_key=key, analyzer_name=key, score=60.0)
+            for key in ("prompt_quality", "tool_usage")
+        ]
+        storage.save_analysis_results(results, "claude_code")
+        scores = storage.get_latest_scores("claude_code", limit=10)
+        assert {s["analyzer_key"] for s in scores} == {"prompt_quality", "tool_usage"}
+
+
+class TestTransaction:
+    def test_rolls_back_nested_writes(self, storage):
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.set_config("a", "1")
+                with storage.transaction():
+                    storage.set_config("b", "2")
+                raise RuntimeError("boom")
+        assert storage.get_configs(["a", "b"]) == {}
+
+    def test_commits_on_success(self, storage):
+        with storage.transaction():
+            storage.set_config("a", "1")
+            storage.save_trend_points(
+                [("prompt_quality", 70.0), ("overall_score", 65.0)],
+                "claude_code", datetime.now(timezone.utc),
+            )
+        assert storage.get_config("a") == "1"
+        assert len(storage.get_trend("overall_score", "claude_code")) == 1
+
+
+class TestCleanup:
+    def test_removes_only_expired_rows(self, storage):
+        for score in (50.0, 60.0):
+            storage.save_analysis_result(
+                AnalysisResult(analyzer_key="prompt_quality", analyzer_name="PQ", score=score),
+                "claude_code",
+            )
+        storage.conn.execute(
+            "UPDATE analysis_results SET created_at = datetime('now', '-200 days')"
+            " WHERE score = 50.0"
+        )
+        now = datetime.now(timezone.utc)
+        storage.save_trend_points([("prompt_quality", 50.0)], "claude_code", now - timedelta(days=200))
+        storage.save_trend_points([("prompt_quality", 60.0)], "claude_code", now)
+
+        storage.cleanup_old_data(retention_days=180)
+
+        scores = storage.get_latest_scores("claude_code")
+        assert [s["score"] for s in scores] == [60.0]
+        assert [p["metric_value"] for p in storage.get_trend("prompt_quality", "claude_code")] == [60.0]
+        assert storage.conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0] == 1
+
+
+class TestThreading:
+    def test_each_thread_gets_its_own_connection(self, storage):
+        import threading
+
+        seen = []
+
+        def worker():
+            storage.set_config("from_worker", "1")
+            seen.append(storage.conn)
+            storage.close()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen[0] is not storage.conn
+        assert storage.get_config("from_worker") == "1"
 
 
 class TestReports:
@@ -100,6 +253,7 @@ class TestReports:
         latest = storage.get_latest_report("claude_code")
         assert latest is not None
         assert latest["overall_score"] == 68.0
+        assert json.loads(latest["report_data"]) == report.to_dict()
 
 
 class TestTrends:
@@ -116,6 +270,20 @@ class TestTrends:
         trend = storage.get_trend("prompt_quality", "claude_code", days=30)
         assert len(trend) == 5
 
+    def test_get_trends_bulk(self, storage):
+        now = datetime.now(timezone.utc)
+        storage.save_trend_points(
+            [("prompt_quality", 60.0), ("tool_usage", 70.0)],
+            "claude_code", now - timedelta(days=2),
+        )
+        storage.save_trend_points([("prompt_quality", 65.0)], "claude_code", now)
+        trends = storage.get_trends(
+            ["prompt_quality", "tool_usage", "rule_file"], "claude_code", days=30
+        )
+        assert set(trends) == {"prompt_quality", "tool_usage"}
+        assert [p["metric_value"] for p in trends["prompt_quality"]] == [60.0, 65.0]
+        assert trends["prompt_quality"] == storage.get_trend("prompt_quality", "claude_code")
+
     def test_empty_trend(self, storage):
         trend = storage.get_trend("nonexistent", "claude_code", days=30)
         assert trend == []
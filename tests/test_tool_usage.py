@@ -0,0 +1,94 @@
+"""Tests for the Tool Usage analyzer."""
+
+import pytest
+
+from sparkey_reflect.analyzers.tool_usage import ToolUsageAnalyzer
+from sparkey_reflect.core.models import ToolCall
+
+
+@pytest.fixture
+def analyzer():
+    return ToolUsageAnalyzer()
+
+
+class TestToolUsageAnalyzer:
+    def test_key_and_name(self, analyzer):
+        assert analyzer.get_key() == "tool_usage"
+        assert analyzer.get_name() == "Tool Usage"
+
+    def test_empty_sessions(self, analyzer):
+        result = analyzer.analyze([])
+        assert result.score == 0
+        assert result.session_count == 0
+
+    def test_tool_call_counts(self, analyzer, make_session, make_turn):
+        session = make_session(turns=[
+            make_turn(content="Fix the bug in auth.py"),
+            make_turn(role="assistant", content="On it.", tool_calls=[
+                ToolCall("Read"), ToolCall("Edit"), ToolCall("Read"),
+                ToolCall("mcp__github__create_pr"), ToolCall(""),
+            ]),
+        ])
+        result = analyzer.analyze([session])
+        assert result.metrics["total_tool_calls"] == 4
+        assert result.metrics["unique_tools_used"] == 3
+        assert result.metrics["mcp_tool_calls"] == 1
+        assert result.metrics["unique_mcp_tools"] == 1
+        assert result.metrics["top_tools"]["Read"] == 2
+
+    def test_bash_file_ops_lower_appropriateness(self, analyzer, make_session, make_turn):
+        session = make_session(turns=[
+            make_turn(role="assistant", content="", tool_calls=[
+                ToolCall("Bash", input={"command": "sed -i 's/a/b/' app.py"}),
+                ToolCall("Bash", input="cat app.py"),
+                ToolCall("Edit"),
+            ]),
+        ])
+        result = analyzer.analyze([session])
+        assert result.metrics["tool_appropriateness"] == pytest.approx(1 / 3, abs=0.001)
+
+    def test_slash_commands_and_automation_misses(self, analyzer, make_session, make_turn):
+        session = make_session(turns=[
+            make_turn(content="/commit"),
+            make_turn(content="Can you run the tests?"),
+            make_turn(content="Here is the output from the build"),
+        ])
+        result = analyzer.analyze([session])
+        assert result.metrics["slash_command_count"] == 1
+        assert result.metrics["automation_misses"] == 2
+
+    def test_slash_command_phrase_without_slash(self, analyzer, make_session, make_turn):
+        session = make_session(turns=[
+            make_turn(content="Is there a Slash Command for this?"),
+            make_turn(content="Rename the helper in utils.py"),
+        ])
+        result = analyzer.analyze([session])
+        assert result.metrics["slash_command_count"] == 1
+
+    def test_score_bounded_0_100(self, analyzer, sample_sessions):
+        result = analyzer.analyze(sample_sessions)
+        assert 0 <= result.score <= 100
+        assert result.session_count == 3
+
+    def test_re2_screen_used_for_ascii_prompts_only(self, analyzer, make_session, make_turn, monkeypatch):
+        import sparkey_reflect.analyzers.tool_usage as tool_usage
+
+        screened = []
+
+        class StubRE2:
+            """Stands in for a compiled re2 pattern, recording what it scans."""
+
+            def search(self, text):
+                screened.append(text)
+                return tool_usage.USER_CONTENT_RE.search(text)
+
+        session = make_session(turns=[
+            make_turn(content="/commit"),
+            make_turn(content="Can you run the tests?"),
+            make_turn(content="Lance les tests, s'il te plaît"),
+        ])
+        expected = analyzer.analyze([session]).metrics
+        monkeypatch.setattr(tool_usage, "USER_CONTENT_RE2", StubRE2())
+        result = analyzer.analyze([session])
+        assert screened == ["/commit", "can you run the tests?"]
+        assert result.metrics == expected